@@ -23,6 +23,7 @@ class AvatarConf(AppConf):
     STORAGE = settings.DEFAULT_FILE_STORAGE
     CLEANUP_DELETED = False
     AUTO_GENERATE_SIZES = (DEFAULT_SIZE,)
+    THUMBNAIL_WORKERS = 2
 
     def configure_auto_generate_avatar_sizes(self, value):
         return value or getattr(settings, 'AUTO_GENERATE_AVATAR_SIZES',
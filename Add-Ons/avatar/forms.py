@@ -9,13 +9,12 @@ from django.template.defaultfilters import filesizeformat
 
 from avatar.conf import settings
 from avatar.models import Avatar
+from avatar.util import get_avatar_url
 
 
 def avatar_img(avatar, size):
-    if not avatar.thumbnail_exists(size):
-        avatar.create_thumbnail(size)
     return mark_safe('<img src="%s" alt="%s" width="%s" height="%s" />' %
-                     (avatar.avatar_url(size), six.text_type(avatar),
+                     (get_avatar_url(avatar, size), six.text_type(avatar),
                       size, size))
 
 
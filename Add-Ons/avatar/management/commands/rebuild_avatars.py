@@ -1,15 +1,135 @@
+import multiprocessing
+import time
+from optparse import make_option
+
+from django.core.cache import cache
 from django.core.management.base import NoArgsCommand
+from django.db import connections
 
 from avatar.conf import settings
 from avatar.models import Avatar
+from avatar.util import get_user_model
+
+
+def thumbnail_is_fresh(avatar, size):
+    """
+    Returns True when ``avatar``'s thumbnail at ``size`` exists and is newer
+    than the upload it was made from. Storages that cannot tell file times
+    never have fresh thumbnails.
+    """
+    storage = avatar.avatar.storage
+    try:
+        return (storage.modified_time(avatar.avatar_name(size)) >=
+                storage.modified_time(avatar.avatar.name))
+    except (OSError, IOError, NotImplementedError):
+        return False
+
+
+def close_connections():
+    """
+    Closes the database and cache connections of a worker process, so the
+    ones it inherited are never shared with the parent. The worker opens its
+    own the first time it needs them, for instance when create_thumbnails
+    invalidates the cached urls.
+    """
+    for connection in connections.all():
+        connection.close()
+    cache.close()
+
+
+def rebuild_avatar(job):
+    """
+    Rebuilds the stale thumbnails of one avatar. Takes a
+    ``(pk, file name, username, sizes, force)`` tuple so the avatar is not
+    queried and returns ``(pk, rebuilt, skipped, failures)``, where each
+    failure is a ``(size, reason)`` tuple.
+    """
+    pk, name, username, sizes, force = job
+    User = get_user_model()
+    user = User(**{getattr(User, 'USERNAME_FIELD', 'username'): username})
+    avatar = Avatar(pk=pk, user=user, avatar=name)
+    stale = [size for size in sizes
+             if force or not thumbnail_is_fresh(avatar, size)]
+    if not stale:
+        return pk, 0, len(sizes), []
+    try:
+        created = avatar.create_thumbnails(stale)
+    except Exception as e:
+        reason = "%s: %s" % (type(e).__name__, e)
+    else:
+        if created:
+            return pk, len(stale), len(sizes) - len(stale), []
+        reason = "the upload could not be read"
+    return pk, 0, len(sizes) - len(stale), [(size, reason) for size in stale]
 
 
 class Command(NoArgsCommand):
     help = ("Regenerates avatar thumbnails for the sizes specified in "
             "settings.AVATAR_AUTO_GENERATE_SIZES.")
 
+    option_list = NoArgsCommand.option_list + (
+        make_option('--workers', type='int',
+                    default=multiprocessing.cpu_count(),
+                    help='Number of processes rebuilding thumbnails '
+                         '(default: one per CPU).'),
+        make_option('--force', action='store_true', default=False,
+                    help='Rebuild thumbnails that are newer than their '
+                         'upload too.'),
+        make_option('--chunk-size', type='int', default=20,
+                    help='Avatars handed to a worker at a time '
+                         '(default 20).'),
+    )
+
     def handle_noargs(self, **options):
-        for avatar in Avatar.objects.all():
-            for size in settings.AVATAR_AUTO_GENERATE_SIZES:
-                print("Rebuilding Avatar id=%s at size %s." % (avatar.id, size))
-                avatar.create_thumbnail(size)
+        sizes = tuple(settings.AVATAR_AUTO_GENERATE_SIZES)
+        force = options['force']
+        verbosity = int(options.get('verbosity', 1))
+        username_field = getattr(get_user_model(), 'USERNAME_FIELD',
+                                 'username')
+        rows = (Avatar.objects.exclude(avatar='').order_by('pk')
+                .values_list('pk', 'avatar', 'user__%s' % username_field)
+                .iterator())
+        jobs = ((pk, name, username, sizes, force)
+                for pk, name, username in rows)
+
+        pool = None
+        if options['workers'] > 1:
+            # Forked workers must not share the parent's connections, so
+            # they are closed before forking and again in each worker.
+            close_connections()
+            pool = multiprocessing.Pool(options['workers'],
+                                        initializer=close_connections)
+            results = pool.imap_unordered(rebuild_avatar, jobs,
+                                          options['chunk_size'])
+        else:
+            results = (rebuild_avatar(job) for job in jobs)
+
+        start = time.time()
+        avatars = rebuilt = skipped = 0
+        failures = []
+        try:
+            for pk, done, fresh, failed in results:
+                avatars += 1
+                rebuilt += done
+                skipped += fresh
+                failures.extend((pk, size, reason) for size, reason in failed)
+                if verbosity > 1:
+                    self.stdout.write("Avatar id=%s: %s rebuilt, %s up to "
+                                      "date, %s failed." %
+                                      (pk, done, fresh, len(failed)))
+                elif verbosity and avatars % 1000 == 0:
+                    self.stdout.write("%s avatars done." % avatars)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+        elapsed = time.time() - start
+        self.stdout.write(
+            "%s avatars in %.1f s (%.1f avatars/s): %s thumbnails rebuilt, "
+            "%s up to date, %s failed." %
+            (avatars, elapsed, avatars / elapsed if elapsed else 0.0,
+             rebuilt, skipped, len(failures)))
+        for pk, size, reason in failures:
+            self.stderr.write("Could not rebuild Avatar id=%s at size %s: "
+                              "%s." % (pk, size, reason))
@@ -13,6 +13,7 @@ from django.db.models import signals
 
 from avatar.conf import settings
 from avatar.util import get_username, force_bytes, invalidate_cache
+from avatar.thumbnails import queue_thumbnails
 
 try:
     from django.utils.timezone import now
@@ -89,31 +90,69 @@ class Avatar(models.Model):
         return self.avatar.storage.exists(self.avatar_name(size))
 
     def create_thumbnail(self, size, quality=None):
-        # invalidate the cache of the thumbnail with the given size first
-        invalidate_cache(self.user, size)
+        return self.create_thumbnails([size], quality)
+
+    def create_thumbnails(self, sizes=None, quality=None):
+        """
+        Creates the thumbnails of every size in ``sizes``, by default
+        ``AVATAR_AUTO_GENERATE_SIZES``, from a single decode of the upload.
+
+        JPEG uploads are decoded in draft mode at the smallest scale that is
+        still at least as large as the biggest size. The square crop is then
+        resized to each size in descending order, each one from the one
+        before. Returns False when the upload could not be read.
+        """
+        sizes = sorted(set(sizes or settings.AVATAR_AUTO_GENERATE_SIZES),
+                       reverse=True)
+        quality = quality or settings.AVATAR_THUMB_QUALITY
+        storage = self.avatar.storage
+        # invalidate the cache of the thumbnails first
+        for size in sizes:
+            invalidate_cache(self.user, size)
         try:
-            orig = self.avatar.storage.open(self.avatar.name, 'rb')
-            image = Image.open(orig)
-            quality = quality or settings.AVATAR_THUMB_QUALITY
-            w, h = image.size
-            if w != size or h != size:
-                if w > h:
-                    diff = int((w - h) / 2)
-                    image = image.crop((diff, 0, w - diff, h))
-                else:
-                    diff = int((h - w) / 2)
-                    image = image.crop((0, diff, w, h - diff))
-                if image.mode != "RGB":
-                    image = image.convert("RGB")
-                image = image.resize((size, size), settings.AVATAR_RESIZE_METHOD)
-                thumb = six.BytesIO()
-                image.save(thumb, settings.AVATAR_THUMB_FORMAT, quality=quality)
-                thumb_file = ContentFile(thumb.getvalue())
-            else:
-                thumb_file = File(orig)
-            thumb = self.avatar.storage.save(self.avatar_name(size), thumb_file)
+            orig = storage.open(self.avatar.name, 'rb')
+            try:
+                image = Image.open(orig)
+                w, h = image.size
+                image.draft("RGB", (sizes[0], sizes[0]))
+                image.load()
+                # Crop the centre square, in draft coordinates.
+                dw, dh = image.size
+                side = min(dw, dh)
+                left, top = (dw - side) // 2, (dh - side) // 2
+                square = image.crop((left, top, left + side, top + side))
+                if square.mode != "RGB":
+                    square = square.convert("RGB")
+
+                previous = None
+                for size in sizes:
+                    name = self.avatar_name(size)
+                    if w == size and h == size:
+                        orig.seek(0)
+                        thumb_file = File(orig)
+                    else:
+                        # Downscale from the last thumbnail, but never
+                        # upscale from one.
+                        if previous is not None and previous.size[0] <= side:
+                            source = previous
+                        else:
+                            source = square
+                        previous = source.resize((size, size),
+                                                 settings.AVATAR_RESIZE_METHOD)
+                        thumb = six.BytesIO()
+                        previous.save(thumb, settings.AVATAR_THUMB_FORMAT,
+                                      quality=quality)
+                        thumb_file = ContentFile(thumb.getvalue())
+                    # Replace the old thumbnail rather than saving next to it
+                    # under another name.
+                    if storage.exists(name):
+                        storage.delete(name)
+                    storage.save(name, thumb_file)
+            finally:
+                orig.close()
         except IOError:
-            return  # What should we do here?  Render a "sorry, didn't work" img?
+            return False  # What should we do here?  Render a "sorry, didn't work" img?
+        return True
 
     def avatar_url(self, size):
         return self.avatar.storage.url(self.avatar_name(size))
@@ -137,8 +176,7 @@ def invalidate_avatar_cache(sender, instance, **kwargs):
 def create_default_thumbnails(sender, instance, created=False, **kwargs):
     invalidate_avatar_cache(sender, instance)
     if created:
-        for size in settings.AVATAR_AUTO_GENERATE_SIZES:
-            instance.create_thumbnail(size)
+        queue_thumbnails(instance, settings.AVATAR_AUTO_GENERATE_SIZES)
 
 
 def remove_avatar_images(instance=None, **kwargs):
@@ -1,12 +1,5 @@
-import hashlib
-
-try:
-    from urllib.parse import urljoin, urlencode
-except ImportError:
-    from urlparse import urljoin
-    from urllib import urlencode
-
 from django import template
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
 from django.template.loader import render_to_string
 from django.utils import six
@@ -14,28 +7,23 @@ from django.utils.translation import ugettext as _
 
 from avatar.conf import settings
 from avatar.util import (get_primary_avatar, get_default_avatar_url,
-                         cache_result, get_user_model, get_user, force_bytes)
+                         get_backup_avatar_url, get_avatar_url, cache_result,
+                         cache_set, get_cache_key,
+                         placeholders_served, get_user_model, get_user,
+                         get_username)
 from avatar.models import Avatar
 
 register = template.Library()
 
 
-@cache_result()
 @register.simple_tag
+@cache_result()
 def avatar_url(user, size=settings.AVATAR_DEFAULT_SIZE):
     avatar = get_primary_avatar(user, size=size)
     if avatar:
-        return avatar.avatar_url(size)
-
-    if settings.AVATAR_GRAVATAR_BACKUP:
-        params = {'s': str(size)}
-        if settings.AVATAR_GRAVATAR_DEFAULT:
-            params['d'] = settings.AVATAR_GRAVATAR_DEFAULT
-        path = "%s/?%s" % (hashlib.md5(force_bytes(user.email)).hexdigest(),
-                           urlencode(params))
-        return urljoin(settings.AVATAR_GRAVATAR_BASE_URL, path)
+        return get_avatar_url(avatar, size)
 
-    return get_default_avatar_url()
+    return get_backup_avatar_url(user, size)
 
 
 @cache_result()
@@ -61,6 +49,31 @@ def avatar(user, size=settings.AVATAR_DEFAULT_SIZE, **kwargs):
     return render_to_string('avatar/avatar_tag.html', context)
 
 
+@register.simple_tag
+def prefetched_avatar(avatar_urls, user, size=settings.AVATAR_DEFAULT_SIZE,
+                      **kwargs):
+    """
+    Renders the same tag as ``avatar`` with the url looked up in
+    ``avatar_urls``, a dict built by ``avatar.util.get_primary_avatar_urls``
+    for the same size, so no query is made. Users missing from it fall back
+    to ``avatar``.
+    """
+    if isinstance(user, get_user_model()):
+        username = get_username(user)
+    else:
+        username = user
+    url = (avatar_urls or {}).get(username)
+    if url is None:
+        return avatar(user, size)
+    context = dict(kwargs, **{
+        'user': user,
+        'url': url,
+        'alt': six.text_type(user),
+        'size': size,
+    })
+    return render_to_string('avatar/avatar_tag.html', context)
+
+
 @register.filter
 def has_avatar(user):
     if not isinstance(user, get_user_model()):
@@ -83,13 +96,22 @@ def primary_avatar(user, size=settings.AVATAR_DEFAULT_SIZE):
             (url, alt, size, size))
 
 
-@cache_result()
 @register.simple_tag
 def render_avatar(avatar, size=settings.AVATAR_DEFAULT_SIZE):
-    if not avatar.thumbnail_exists(size):
-        avatar.create_thumbnail(size)
-    return """<img src="%s" alt="%s" width="%s" height="%s" />""" % (
-        avatar.avatar_url(size), six.text_type(avatar), size, size)
+    # Cached under its user like the other tags, so invalidate_cache clears
+    # it, with one entry per avatar of that user.
+    prefix = 'render_avatar'
+    key = get_cache_key(avatar.user, size, prefix)
+    rendered = cache.get(key) or {}
+    if avatar.pk in rendered:
+        return rendered[avatar.pk]
+    served = placeholders_served()
+    result = """<img src="%s" alt="%s" width="%s" height="%s" />""" % (
+        get_avatar_url(avatar, size), six.text_type(avatar), size, size)
+    if placeholders_served() == served:
+        rendered[avatar.pk] = result
+        cache_set(key, rendered)
+    return result
 
 
 @register.tag
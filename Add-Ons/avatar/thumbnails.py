@@ -0,0 +1,114 @@
+"""
+Background creation of avatar thumbnails.
+
+Decoding, cropping and resizing an upload with PIL is far too slow to do
+while a page is rendered, so missing thumbnails are handed to a small pool
+of worker threads instead. A thumbnail that is already queued or being
+created is not queued again, however many pages ask for it meanwhile.
+"""
+import logging
+import os
+import threading
+
+from django.db import close_old_connections
+from django.utils.six.moves import queue
+
+from avatar.conf import settings
+from avatar.util import invalidate_cache
+
+logger = logging.getLogger(__name__)
+
+_jobs = queue.Queue()
+_pending = set()
+_lock = threading.Lock()
+_workers = []
+_pid = None
+
+
+def _job_key(avatar, size):
+    # The file name is part of the key so a replaced upload is not mistaken
+    # for the job of the file it replaced.
+    return (avatar.pk, avatar.avatar.name, size)
+
+
+def _work(jobs):
+    while True:
+        keys, avatar, sizes = jobs.get()
+        try:
+            avatar.create_thumbnails(sizes)
+            # Pages rendered while the job waited cached the original url,
+            # drop them so the thumbnails are picked up.
+            for size in sizes:
+                invalidate_cache(avatar.user, size)
+        except Exception:
+            logger.exception("Could not create the %s thumbnails of avatar "
+                             "id=%s", sizes, avatar.pk)
+        finally:
+            with _lock:
+                _pending.difference_update(keys)
+            close_old_connections()
+            jobs.task_done()
+
+
+def _reset_after_fork():
+    # Threads do not survive a fork, so a forked server process starts with
+    # a queue, pending set and lock of its own. The inherited ones may hold
+    # jobs the parent's threads had taken and would never clear here.
+    global _jobs, _pending, _lock, _workers, _pid
+    if _pid != os.getpid():
+        _jobs = queue.Queue()
+        _pending = set()
+        _lock = threading.Lock()
+        _workers = []
+        _pid = os.getpid()
+
+
+def _start_workers():
+    if _workers:
+        return
+    for i in range(settings.AVATAR_THUMBNAIL_WORKERS):
+        worker = threading.Thread(target=_work, args=(_jobs,),
+                                  name="avatar-thumbnails-%s" % i)
+        worker.daemon = True
+        worker.start()
+        _workers.append(worker)
+
+
+def queue_thumbnails(avatar, sizes):
+    """
+    Queues the creation of ``avatar``'s thumbnails at ``sizes`` as one job,
+    so the upload is decoded once for all of them. Sizes already queued or
+    being created are left out, returns False when that is all of them.
+
+    With ``AVATAR_THUMBNAIL_WORKERS`` set to 0 the thumbnails are created
+    straight away instead.
+    """
+    if not settings.AVATAR_THUMBNAIL_WORKERS:
+        avatar.create_thumbnails(sizes)
+        return True
+    _reset_after_fork()
+    with _lock:
+        keys = dict((_job_key(avatar, size), size) for size in sizes)
+        for key in _pending.intersection(keys):
+            del keys[key]
+        if not keys:
+            return False
+        _pending.update(keys)
+        _start_workers()
+    _jobs.put((set(keys), avatar, sorted(keys.values())))
+    return True
+
+
+def queue_thumbnail(avatar, size):
+    """
+    Queues the creation of ``avatar``'s thumbnail at ``size``. Returns False
+    when the same thumbnail is already queued or being created.
+    """
+    return queue_thumbnails(avatar, [size])
+
+
+def wait_for_thumbnails():
+    """
+    Blocks until every queued thumbnail has been created.
+    """
+    _jobs.join()
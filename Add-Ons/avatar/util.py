@@ -1,4 +1,12 @@
+import functools
 import hashlib
+import threading
+
+try:
+    from urllib.parse import urljoin, urlencode
+except ImportError:
+    from urlparse import urljoin
+    from urllib import urlencode
 
 from django.core.cache import cache
 from django.utils import six
@@ -24,7 +32,23 @@ else:
 from avatar.conf import settings
 
 
-cached_funcs = set()
+# Prefixes of everything cached per user and size, cleared by
+# invalidate_cache. They are listed here rather than added when first used
+# so a process that never rendered a tag, such as a thumbnail worker, still
+# clears them all.
+cached_funcs = set(['avatar', 'avatar_url', 'primary_avatar',
+                    'render_avatar'])
+
+# Counts the placeholder urls get_avatar_url has returned in this thread, so
+# results built from one are not cached.
+_placeholders = threading.local()
+
+
+def placeholders_served():
+    """
+    Returns how many placeholder urls this thread has been given so far.
+    """
+    return getattr(_placeholders, 'count', 0)
 
 
 def get_username(user):
@@ -65,14 +89,19 @@ def cache_result(default_size=settings.AVATAR_DEFAULT_SIZE):
     ``size`` value.
     """
     def decorator(func):
+        prefix = func.__name__
+        cached_funcs.add(prefix)
+
+        @functools.wraps(func)
         def cached_func(user, size=None):
-            prefix = func.__name__
-            cached_funcs.add(prefix)
             key = get_cache_key(user, size or default_size, prefix=prefix)
             result = cache.get(key)
             if result is None:
+                served = placeholders_served()
                 result = func(user, size or default_size)
-                cache_set(key, result)
+                # A placeholder would outlive the thumbnail replacing it.
+                if placeholders_served() == served:
+                    cache_set(key, result)
             return result
         return cached_func
     return decorator
@@ -125,7 +154,95 @@ def get_primary_avatar(user, size=settings.AVATAR_DEFAULT_SIZE):
         avatar = user.avatar_set.order_by("-primary", "-date_uploaded")[0]
     except IndexError:
         avatar = None
-    if avatar:
-        if not avatar.thumbnail_exists(size):
-            avatar.create_thumbnail(size)
     return avatar
+
+
+def get_avatar_url(avatar, size=settings.AVATAR_DEFAULT_SIZE):
+    """
+    Returns the url of ``avatar``'s thumbnail at ``size``. A missing thumbnail
+    is queued for the background workers and the original upload, or the
+    default avatar when there is none, is returned until it exists. Such
+    placeholders are counted by ``placeholders_served`` and never cached.
+    """
+    if avatar.thumbnail_exists(size):
+        return avatar.avatar_url(size)
+
+    from avatar.thumbnails import queue_thumbnail
+    queue_thumbnail(avatar, size)
+    _placeholders.count = placeholders_served() + 1
+    if avatar.avatar.name:
+        return avatar.avatar.storage.url(avatar.avatar.name)
+    return get_default_avatar_url()
+
+
+def get_backup_avatar_url(user, size=settings.AVATAR_DEFAULT_SIZE):
+    """
+    Returns the url shown for a user without an avatar, their gravatar when
+    ``AVATAR_GRAVATAR_BACKUP`` is on and the default avatar otherwise.
+    """
+    if settings.AVATAR_GRAVATAR_BACKUP:
+        params = {'s': str(size)}
+        if settings.AVATAR_GRAVATAR_DEFAULT:
+            params['d'] = settings.AVATAR_GRAVATAR_DEFAULT
+        path = "%s/?%s" % (hashlib.md5(force_bytes(user.email)).hexdigest(),
+                           urlencode(params))
+        return urljoin(settings.AVATAR_GRAVATAR_BASE_URL, path)
+
+    return get_default_avatar_url()
+
+
+def get_primary_avatar_urls(users, size=settings.AVATAR_DEFAULT_SIZE):
+    """
+    Returns a dict of username to the url ``avatar_url`` gives each of
+    ``users`` (User instances or usernames) at ``size``.
+
+    Urls already cached by ``avatar_url`` are read with one cache call and
+    every other user and their avatars are read with a single query. The
+    results are cached under the same keys, so later ``avatar_url`` calls,
+    including the one the ``avatar`` tag makes, hit them too. Placeholders
+    for thumbnails that are still being created are not cached. Unknown
+    usernames are left out.
+    """
+    from avatar.models import Avatar
+
+    User = get_user_model()
+    usernames = set(get_username(user) if isinstance(user, User) else user
+                    for user in users)
+    prefix = 'avatar_url'
+    keys = dict((get_cache_key(username, size, prefix), username)
+                for username in usernames)
+    urls = dict((keys[key], url)
+                for key, url in cache.get_many(list(keys)).items())
+    missing = usernames.difference(urls)
+    if not missing:
+        return urls
+
+    # One row per avatar, or a single row of None for users without any.
+    username_field = getattr(User, 'USERNAME_FIELD', 'username')
+    rows = User.objects.filter(**{'%s__in' % username_field: missing})
+    rows = rows.values_list('pk', username_field, 'email', 'avatar__pk',
+                            'avatar__primary', 'avatar__date_uploaded',
+                            'avatar__avatar')
+    found = {}
+    for row in rows:
+        best = found.get(row[1])
+        # Same order as get_primary_avatar: primary first, then newest.
+        if (best is None or best[3] is None or
+                (row[3] is not None and row[4:6] > best[4:6])):
+            found[row[1]] = row
+
+    for username, (user_pk, _, email, pk, primary, date_uploaded,
+                   name) in found.items():
+        user = User(pk=user_pk, email=email, **{username_field: username})
+        if pk is None:
+            url = get_backup_avatar_url(user, size)
+        else:
+            avatar = Avatar(pk=pk, user=user, primary=primary,
+                            date_uploaded=date_uploaded, avatar=name)
+            served = placeholders_served()
+            url = get_avatar_url(avatar, size)
+            if placeholders_served() != served:
+                urls[username] = url
+                continue
+        urls[username] = cache_set(get_cache_key(username, size, prefix), url)
+    return urls
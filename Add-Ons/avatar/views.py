@@ -11,7 +11,7 @@ from avatar.forms import PrimaryAvatarForm, DeleteAvatarForm, UploadAvatarForm
 from avatar.models import Avatar
 from avatar.signals import avatar_updated
 from avatar.util import (get_primary_avatar, get_default_avatar_url,
-                         get_user_model, get_user)
+                         get_avatar_url, get_user_model, get_user)
 
 
 def _get_next(request):
@@ -227,7 +227,7 @@ def render_primary(request, user=None, size=settings.AVATAR_DEFAULT_SIZE):
         # be useful in certain situations, particulary if there is a CDN and
         # we want to minimize the storage usage on our static server, letting
         # the CDN store those files instead
-        url = avatar.avatar_url(size)
+        url = get_avatar_url(avatar, size)
     else:
         url = get_default_avatar_url()
 
@@ -47,7 +47,6 @@ INSTALLED_APPS = (
     'south',
     'avatar',
     'django_messages',
-    'chartit',
     'password_reset',
     'django.contrib.humanize',
     
@@ -40,7 +40,6 @@ INSTALLED_APPS = (
     'south',
     'avatar',
     'django_messages',
-    'chartit',
     'password_reset',
     'django.contrib.humanize',
     'djangosecure',
@@ -77,6 +76,22 @@ DATABASES = {
     }
 }
 
+# Cache
+# https://docs.djangoproject.com/en/1.6/topics/cache/
+# The leaderboard snapshots, cached sidebars and recommendation pages are
+# refreshed by one process and read by all of them, so the cache has to be
+# shared.  The default per-process LocMemCache would leave the other processes
+# serving their own stale copies.  Memcached keeps it in memory, so reading a
+# cached page or sidebar costs no database query, and it evicts the least
+# recently used entries instead of culling a third of them at once
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.memcached.MemcachedCache',
+        'LOCATION': '127.0.0.1:11211',
+    }
+}
+
 # Internationalization
 # https://docs.djangoproject.com/en/1.6/topics/i18n/
 
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from BucketList.models import BucketListItem, UserProfile, Comment
+from BucketList.models import BucketListItem, UserProfile, Comment, UserActivity
 
 
 class BucketListItemAdmin(admin.ModelAdmin):
@@ -37,4 +37,11 @@ admin.site.register(Comment, CommentAdmin)
 
     
     
-    
\ No newline at end of file
+    
+
+
+class UserActivityAdmin(admin.ModelAdmin):
+    list_display = ['user', 'score', 'items_created', 'items_crossed_off', 'comments_authored', 'comments_received']
+    readonly_fields = ('user', 'score', 'items_created', 'items_crossed_off', 'comments_authored', 'comments_received')
+    
+admin.site.register(UserActivity, UserActivityAdmin)
@@ -0,0 +1,102 @@
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from BucketList.models import BucketListItem, GoalTypeTotals
+from BucketList.recommendation import ValueArrays
+from BucketList.recommendation_cache import BumpGoalTypeCountsVersion
+
+
+#Seconds the sorted goal distributions are kept before they are read from the database again, percentiles may lag new goals by this long
+GOAL_DISTRIBUTIONS_TIMEOUT = getattr(settings, 'GOAL_DISTRIBUTIONS_TIMEOUT', 60 * 10)
+
+GOAL_DISTRIBUTIONS_KEY = 'goal_distributions'
+
+
+def GoalTotalsKey(item):
+    #Takes a BucketListItem and returns the GoalTypeTotals row it counts towards and the values it adds to it
+    return (item.goal_type, bool(item.crossed_off)), (item.cost, item.hours, item.time)
+
+
+def AddToGoalTypeTotals(key, values, sign):
+    #Takes a (goal_type, crossed_off) key, the (cost, hours, time) of one goal and 1 to add it or -1 to take it away.  The row is changed with a single UPDATE so goals saved at the same time do not overwrite each others changes.  A missing row is created, if another request creates it first the UPDATE is simply run again
+    goal_type, crossed_off = key
+    cost, hours, time = values
+    rows = GoalTypeTotals.objects.filter(goal_type = goal_type, crossed_off = crossed_off)
+    changes = {'count': F('count') + sign, 'cost': F('cost') + sign*cost, 'hours': F('hours') + sign*hours, 'time': F('time') + sign*time}
+    if rows.update(**changes):
+        return
+    try:
+        with transaction.atomic():
+            GoalTypeTotals.objects.create(goal_type = goal_type, crossed_off = crossed_off,
+                                          count = sign, cost = sign*cost, hours = sign*hours, time = sign*time)
+    except IntegrityError:
+        rows.update(**changes)
+
+
+def RememberGoalTotals(item):
+    #Takes a BucketListItem about to be saved and stores the key and values it counted towards before the save on it
+    previous = None
+    if item.pk:
+        previous = BucketListItem.objects.filter(pk = item.pk).first()
+    item._goal_totals_before = GoalTotalsKey(previous) if previous is not None else None
+
+
+def UpdateGoalTypeTotals(item, deleted = False):
+    #Takes a BucketListItem that was just saved or deleted and moves its values between GoalTypeTotals rows, nothing is written when none of the counted fields changed.  The site chart is made stale when the goal was added, removed or changed goal type
+    if deleted:
+        before, after = GoalTotalsKey(item), None
+    else:
+        before, after = getattr(item, '_goal_totals_before', None), GoalTotalsKey(item)
+    if before == after:
+        return
+    with transaction.atomic():
+        if before is not None:
+            AddToGoalTypeTotals(before[0], before[1], -1)
+        if after is not None:
+            AddToGoalTypeTotals(after[0], after[1], 1)
+    if before is None or after is None or before[0][0] != after[0][0]:
+        BumpGoalTypeCountsVersion()
+
+
+def GoalTypeAverages():
+    #Returns every users average (cost, hours, time) by goal type, open and crossed off goals together
+    totals = {}
+    for goal_type, count, cost, hours, time in GoalTypeTotals.objects.values_list('goal_type', 'count', 'cost', 'hours', 'time'):
+        previous = totals.get(goal_type, (0, 0, 0, 0))
+        totals[goal_type] = (previous[0] + count, previous[1] + cost, previous[2] + hours, previous[3] + time)
+    return dict((goal_type, (float(cost)/count, float(hours)/count, float(time)/count))
+                for goal_type, (count, cost, hours, time) in totals.items() if count)
+
+
+def OpenGoalTotals():
+    #Returns the number of open goals on the site and the sums of their cost, hours and time
+    count = cost = hours = time = 0
+    for totals in GoalTypeTotals.objects.filter(crossed_off = False).values_list('count', 'cost', 'hours', 'time'):
+        count, cost, hours, time = count + totals[0], cost + totals[1], hours + totals[2], time + totals[3]
+    return count, cost, hours, time
+
+
+def SiteAverages():
+    #Returns the site wide numbers the recommendation page compares against, the open goal count and averages under 'open' and every users averages under each goal type
+    count, cost, hours, time = OpenGoalTotals()
+    averages = GoalTypeAverages()
+    averages['open'] = (count, float(cost)/count, float(hours)/count, float(time)/count) if count else (0, 0, 0, 0)
+    return averages
+
+
+def ComputeGoalDistributions():
+    #Returns the cost, hours and days of every open goal as three sorted arrays, read with a single query
+    costs, hours, times = ValueArrays(BucketListItem.objects.filter(crossed_off = False).values_list('cost', 'hours', 'time'))
+    return np.sort(costs), np.sort(hours), np.sort(times)
+
+
+def GoalDistributions():
+    #Returns the sorted cost, hours and days arrays of every open goal with a single cache read, percentiles are then a binary search in them.  Only a cold cache reads every goal in the request
+    distributions = cache.get(GOAL_DISTRIBUTIONS_KEY)
+    if distributions is None:
+        distributions = ComputeGoalDistributions()
+        cache.set(GOAL_DISTRIBUTIONS_KEY, distributions, GOAL_DISTRIBUTIONS_TIMEOUT)
+    return distributions
@@ -0,0 +1,61 @@
+from django.db.models import Sum
+
+from BucketList.models import BucketListItem, GoalTypeTotals
+from BucketList.recommendation_cache import ChartVersions
+
+
+#The pie charts on the recommendation page, the name of their data url, the id of the div each is drawn in, its title, whose goals it shows and which sum of them
+RECOMMENDATION_CHARTS = (
+    ('goals', 'UsersGoalDistributionChart', 'Your Goal Distribution', 'user', 'how_many_items'),
+    ('site', 'AllUsersGoalDistributionChart', 'Average Goal Distribution', 'site', 'how_many_items'),
+    ('cost', 'UsersGoalCostDistributionChart', 'Cost Distribution', 'user', 'cost'),
+    ('hours', 'UsersGoalHoursDistributionChart', 'Hours Distribution', 'user', 'hours'),
+    ('days', 'UsersGoalDaysDistributionChart', 'Days Distribution', 'user', 'time'),
+    )
+
+
+def RecommendationChart(name):
+    #Takes the name of a recommendation chart and returns its (name, div id, title, source, field), None for names that are not a chart
+    for chart in RECOMMENDATION_CHARTS:
+        if chart[0] == name:
+            return chart
+    return None
+
+
+def UserGoalTypeSums(user):
+    #Takes a User and returns the number of goals and the sums of their cost, hours and time for each goal type of every goal they published, read with a single grouped query
+    rows = (BucketListItem.objects.filter(pub_by = user).order_by('goal_type').values_list('goal_type')
+            .annotate(Sum('how_many_items'), Sum('cost'), Sum('hours'), Sum('time')))
+    return [{'goal_type': goal_type, 'how_many_items': count, 'cost': cost, 'hours': hours, 'time': time}
+            for goal_type, count, cost, hours, time in rows]
+
+
+def SiteGoalTypeCounts():
+    #Returns the number of goals of each goal type on the site, open and crossed off, from the running GoalTypeTotals instead of a scan of every goal
+    counts = {}
+    for goal_type, count in GoalTypeTotals.objects.values_list('goal_type', 'count'):
+        counts[goal_type] = counts.get(goal_type, 0) + count
+    return [{'goal_type': goal_type, 'how_many_items': counts[goal_type]} for goal_type in sorted(counts) if counts[goal_type]]
+
+
+def PieChartOptions(render_to, title, rows, field):
+    #Takes the id of the div to draw in, the chart title, goal type rows and the field of them to show and returns the Highcharts options of a pie chart of it
+    return {
+        'chart': {'renderTo': render_to, 'type': 'pie'},
+        'title': {'text': title},
+        'series': [{'name': field, 'data': [[row['goal_type'], row[field]] for row in rows]}],
+    }
+
+
+def ChartOptions(user, chart):
+    #Takes a User and one of RECOMMENDATION_CHARTS and returns its Highcharts options, a users chart comes from one grouped query and the site chart from GoalTypeTotals
+    name, render_to, title, source, field = chart
+    rows = UserGoalTypeSums(user) if source == 'user' else SiteGoalTypeCounts()
+    return PieChartOptions(render_to, title, rows, field)
+
+
+def ChartETag(user_id, chart):
+    #Takes a user id and one of RECOMMENDATION_CHARTS and returns an ETag for its data that changes with the users version for their own charts and with the goal type counts version for the site chart, no query is needed to check it
+    user_version, counts_version = ChartVersions(user_id)
+    version = user_version if chart[3] == 'user' else counts_version
+    return '%s-%s-%s' % (chart[0], user_id, version)
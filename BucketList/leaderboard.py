@@ -0,0 +1,102 @@
+import collections
+import heapq
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count, F
+from django.utils import timezone
+
+from BucketList.models import BucketListItem, Comment, UserActivity, ActivityScore
+
+
+#Number of days each leaderboard looks back, None means all-time
+LEADERBOARD_WINDOWS = collections.OrderedDict([
+    ('week', 7),
+    ('month', 30),
+    ('all', None),
+])
+DEFAULT_LEADERBOARD_WINDOW = 'all'
+
+LEADERBOARD_SIZE = getattr(settings, 'LEADERBOARD_SIZE', 12)
+LEADERBOARD_CACHE_TIMEOUT = getattr(settings, 'LEADERBOARD_CACHE_TIMEOUT', 60 * 60 * 24)
+#Seconds to wait after activity before refreshing, activity in the meantime is folded into the same refresh
+LEADERBOARD_REFRESH_DELAY = getattr(settings, 'LEADERBOARD_REFRESH_DELAY', 30)
+
+LEADERBOARD_REFRESH_PENDING_KEY = 'leaderboard_refresh_pending'
+
+
+def LeaderboardCacheKey(window):
+    return 'leaderboard_%s' % window
+
+
+def WindowScores(days):
+    #Takes a number of days and returns a dictionary of user id to activity score for everything done in that window.  Goals use pub_date, which is also reset when a goal is edited or crossed off
+    since = timezone.now() - timedelta(days = days)
+    goals = BucketListItem.objects.filter(pub_date__gte = since)
+    comments = Comment.objects.filter(created__gte = since)
+
+    items_created = dict(goals.values_list('pub_by').annotate(Count('id')))
+    items_crossed_off = dict(goals.filter(crossed_off = True).values_list('pub_by').annotate(Count('id')))
+    comments_received = dict(comments.exclude(author = F('item__pub_by__username')).values_list('item__pub_by').annotate(Count('id')))
+
+    #Comments store the authors username so they are mapped back to user ids
+    comments_by_username = dict(comments.values_list('author').annotate(Count('id')))
+    user_ids = dict(User.objects.filter(username__in = comments_by_username.keys()).values_list('username', 'id'))
+    comments_authored = {}
+    for username, count in comments_by_username.items():
+        if username in user_ids:
+            comments_authored[user_ids[username]] = count
+
+    scores = {}
+    for user_id in set(items_created) | set(items_crossed_off) | set(comments_authored) | set(comments_received):
+        scores[user_id] = ActivityScore(items_created.get(user_id, 0), items_crossed_off.get(user_id, 0),
+                                        comments_authored.get(user_id, 0), comments_received.get(user_id, 0))
+    return scores
+
+
+def ComputeLeaderboard(window):
+    #Takes a window name and returns a ranked list of (username, score) tuples for the top LEADERBOARD_SIZE users
+    days = LEADERBOARD_WINDOWS[window]
+    if days is None:
+        return list(UserActivity.objects.order_by('-score').values_list('user__username', 'score')[:LEADERBOARD_SIZE])
+
+    scores = WindowScores(days)
+    top_scores = heapq.nlargest(LEADERBOARD_SIZE, scores.items(), key = lambda pair: pair[1])
+    usernames = dict(User.objects.filter(pk__in = [user_id for user_id, score in top_scores]).values_list('id', 'username'))
+    return [(usernames[user_id], score) for user_id, score in top_scores if user_id in usernames]
+
+
+def RefreshLeaderboards():
+    #Recomputes every window and stores the ranked snapshots in the cache
+    for window in LEADERBOARD_WINDOWS:
+        cache.set(LeaderboardCacheKey(window), ComputeLeaderboard(window), LEADERBOARD_CACHE_TIMEOUT)
+
+
+def _refresh_in_background():
+    try:
+        cache.delete(LEADERBOARD_REFRESH_PENDING_KEY)
+        RefreshLeaderboards()
+    finally:
+        #The timer thread opened its own database connection
+        connection.close()
+
+
+def ScheduleLeaderboardRefresh():
+    #Called when activity happens.  Starts a background refresh unless one is already pending, so a burst of activity costs one refresh and nothing is computed in the request
+    if cache.add(LEADERBOARD_REFRESH_PENDING_KEY, True, LEADERBOARD_REFRESH_DELAY * 2):
+        timer = threading.Timer(LEADERBOARD_REFRESH_DELAY, _refresh_in_background)
+        timer.daemon = True
+        timer.start()
+
+
+def Leaderboard(window):
+    #Takes a window name and returns an ordered dictionary of username to score with a single cache read.  Only a cold cache computes the snapshot in the request
+    leaders = cache.get(LeaderboardCacheKey(window))
+    if leaders is None:
+        leaders = ComputeLeaderboard(window)
+        cache.set(LeaderboardCacheKey(window), leaders, LEADERBOARD_CACHE_TIMEOUT)
+    return collections.OrderedDict(leaders)
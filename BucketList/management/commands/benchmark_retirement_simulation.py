@@ -0,0 +1,40 @@
+import time
+from optparse import make_option
+
+from django.core.management.base import BaseCommand, CommandError
+
+from BucketList.recommendation import RETIREMENT_RATES, RETIREMENT_SIMULATION_PATHS, RetirementStats
+
+
+class Command(BaseCommand):
+    help = ("Times everything the recommendation page works out for the "
+            "Retirement section, the simulation of every return included, for "
+            "a typical profile and fails when the fastest run is slower than "
+            "the budget.")
+
+    option_list = BaseCommand.option_list + (
+        make_option('--paths', type='int', default=RETIREMENT_SIMULATION_PATHS,
+                    help='Number of paths simulated (default %s).' % RETIREMENT_SIMULATION_PATHS),
+        make_option('--years', type='int', default=35,
+                    help='Years until retirement (default 35).'),
+        make_option('--repeat', type='int', default=10,
+                    help='Number of timed runs (default 10).'),
+        make_option('--budget', type='float', default=50,
+                    help='Milliseconds the fastest run may take (default 50).'),
+    )
+
+    def handle(self, *args, **options):
+        age, earnings, savings = 30, 60000.0, 10000.0
+        timings = []
+        for run in range(max(options['repeat'], 1) + 1):
+            start = time.time()
+            stats = RetirementStats(age, age + options['years'], earnings, age + options['years'], savings, 10.0,
+                                    paths = options['paths'])
+            timings.append((time.time() - start)*1000)
+        #The first run pays for warming up NumPy and is not counted
+        timings = sorted(timings[1:])
+        self.stdout.write("%s paths over %s years: fastest %.1f ms, median %.1f ms, success %.1f%%" % (
+            options['paths'], options['years'], timings[0], timings[len(timings)//2],
+            stats['retirement_success_%s' % RETIREMENT_RATES[0][0]]))
+        if timings[0] > options['budget']:
+            raise CommandError("Fastest run took %.1f ms, over the %.0f ms budget." % (timings[0], options['budget']))
@@ -0,0 +1,76 @@
+import random
+import time
+from optparse import make_option
+
+from django.core.management.base import BaseCommand
+from django.contrib.auth.models import User
+
+from BucketList.models import BucketListItem
+from BucketList.search import RankSearchResults, SearchResults, SEARCH_CANDIDATE_LIMIT
+
+
+def misspell(text, rng):
+    #Drops one letter from the longest word, the kind of typo the trigram index is there to catch
+    words = text.split()
+    if not words:
+        return text
+    longest = max(range(len(words)), key=lambda i: len(words[i]))
+    word = words[longest]
+    if len(word) > 3:
+        position = rng.randrange(1, len(word) - 1)
+        words[longest] = word[:position] + word[position + 1:]
+    return ' '.join(words)
+
+
+def result_keys(results):
+    return set((result.__class__.__name__, result.pk) for result in results)
+
+
+class Command(BaseCommand):
+    help = ("Compares the recall and latency of the indexed search against a "
+            "full scan of every BucketListItem and User, using misspelled goal "
+            "texts as queries.")
+
+    option_list = BaseCommand.option_list + (
+        make_option('--queries', type='int', default=50,
+                    help='Number of queries to run (default 50).'),
+        make_option('--limit', type='int', default=SEARCH_CANDIDATE_LIMIT,
+                    help='Candidate limit for the indexed search (default %s).' % SEARCH_CANDIDATE_LIMIT),
+        make_option('--seed', type='int', default=0,
+                    help='Random seed used to pick and misspell the queries.'),
+    )
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        texts = list(BucketListItem.objects.values_list('text', flat=True))
+        if not texts:
+            self.stdout.write("No goals to search.")
+            return
+        queries = [misspell(rng.choice(texts), rng) for i in range(options['queries'])]
+
+        scan_times = []
+        index_times = []
+        recalls = []
+        for query in queries:
+            start = time.time()
+            expected = RankSearchResults(query, BucketListItem.objects.all(), User.objects.all())
+            scan_times.append(time.time() - start)
+
+            start = time.time()
+            found = SearchResults(query, options['limit'])
+            index_times.append(time.time() - start)
+
+            expected = result_keys(expected)
+            if expected:
+                recalls.append(float(len(expected & result_keys(found))) / len(expected))
+
+        def milliseconds(times):
+            times = sorted(times)
+            return (sum(times) / len(times) * 1000, times[len(times) // 2] * 1000)
+
+        self.stdout.write("%s goals, %s users, %s queries, candidate limit %s" %
+                          (len(texts), User.objects.count(), len(queries), options['limit']))
+        self.stdout.write("Full scan: mean %.1f ms, median %.1f ms" % milliseconds(scan_times))
+        self.stdout.write("Indexed:   mean %.1f ms, median %.1f ms" % milliseconds(index_times))
+        self.stdout.write("Recall of the full scan's top results: %.1f%%" %
+                          (sum(recalls) / max(len(recalls), 1) * 100))
@@ -0,0 +1,39 @@
+from django.core.management.base import NoArgsCommand
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Count, F
+
+from BucketList.models import BucketListItem, Comment, UserActivity, ActivityScore
+from BucketList.leaderboard import RefreshLeaderboards
+
+
+class Command(NoArgsCommand):
+    help = ("Rebuilds every UserActivity row from the existing goals and "
+            "comments using a handful of grouped queries.")
+
+    def handle_noargs(self, **options):
+        items_created = dict(BucketListItem.objects.values_list('pub_by').annotate(Count('id')))
+        items_crossed_off = dict(BucketListItem.objects.filter(crossed_off=True).values_list('pub_by').annotate(Count('id')))
+        comments_authored = dict(Comment.objects.values_list('author').annotate(Count('id')))
+        comments_received = dict(Comment.objects.exclude(author=F('item__pub_by__username'))
+                                 .values_list('item__pub_by').annotate(Count('id')))
+
+        activities = []
+        for user_id, username in User.objects.values_list('id', 'username').iterator():
+            activity = UserActivity(
+                user_id=user_id,
+                items_created=items_created.get(user_id, 0),
+                items_crossed_off=items_crossed_off.get(user_id, 0),
+                comments_authored=comments_authored.get(username, 0),
+                comments_received=comments_received.get(user_id, 0),
+            )
+            activity.score = ActivityScore(activity.items_created, activity.items_crossed_off,
+                                           activity.comments_authored, activity.comments_received)
+            activities.append(activity)
+
+        with transaction.atomic():
+            UserActivity.objects.all().delete()
+            UserActivity.objects.bulk_create(activities, batch_size=500)
+        RefreshLeaderboards()
+
+        self.stdout.write("Rebuilt activity counters for %s users." % len(activities))
@@ -0,0 +1,25 @@
+from django.core.management.base import NoArgsCommand
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from BucketList.models import BucketListItem, GoalTypeTotals
+
+
+class Command(NoArgsCommand):
+    help = ("Rebuilds every GoalTypeTotals row from the existing goals with a "
+            "single grouped query, for when goals were changed without their "
+            "save and delete signals.")
+
+    def handle_noargs(self, **options):
+        totals = (BucketListItem.objects.values_list('goal_type', 'crossed_off')
+                  .annotate(Count('id'), Sum('cost'), Sum('hours'), Sum('time')))
+        rows = [GoalTypeTotals(goal_type=goal_type, crossed_off=crossed_off, count=count,
+                               cost=cost or 0, hours=hours or 0, time=time or 0)
+                for goal_type, crossed_off, count, cost, hours, time in totals]
+
+        with transaction.atomic():
+            GoalTypeTotals.objects.all().delete()
+            GoalTypeTotals.objects.bulk_create(rows)
+
+        self.stdout.write("Rebuilt totals for %s goal type rows covering %s goals." %
+                          (len(rows), sum(row.count for row in rows)))
@@ -0,0 +1,33 @@
+from django.core.management.base import NoArgsCommand
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from BucketList.models import BucketListItem, GoalToken, GoalTrigram, UsernameTrigram
+from BucketList.search import NormalizedTokens, Trigrams
+
+
+class Command(NoArgsCommand):
+    help = ("Rebuilds the GoalToken, GoalTrigram and UsernameTrigram search "
+            "indexes from every BucketListItem and User.")
+
+    def handle_noargs(self, **options):
+        tokens = []
+        goal_trigrams = []
+        for item_id, text in BucketListItem.objects.values_list('id', 'text').iterator():
+            tokens.extend(GoalToken(token=token, item_id=item_id) for token in NormalizedTokens(text))
+            goal_trigrams.extend(GoalTrigram(trigram=trigram, item_id=item_id) for trigram in Trigrams(text))
+
+        username_trigrams = []
+        for user_id, username in User.objects.values_list('id', 'username').iterator():
+            username_trigrams.extend(UsernameTrigram(trigram=trigram, user_id=user_id) for trigram in Trigrams(username))
+
+        with transaction.atomic():
+            GoalToken.objects.all().delete()
+            GoalToken.objects.bulk_create(tokens, batch_size=1000)
+            GoalTrigram.objects.all().delete()
+            GoalTrigram.objects.bulk_create(goal_trigrams, batch_size=1000)
+            UsernameTrigram.objects.all().delete()
+            UsernameTrigram.objects.bulk_create(username_trigrams, batch_size=1000)
+
+        self.stdout.write("Indexed %s tokens, %s goal trigrams and %s username trigrams." %
+                          (len(tokens), len(goal_trigrams), len(username_trigrams)))
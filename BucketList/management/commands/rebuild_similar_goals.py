@@ -0,0 +1,37 @@
+import time
+from optparse import make_option
+
+from django.core.management.base import BaseCommand
+
+from BucketList.models import BucketListItem
+from BucketList.similarity import RefreshSimilarGoals
+
+
+class Command(BaseCommand):
+    help = ("Finds the GoalSimilarity neighbours of every BucketListItem from "
+            "scratch, working through the goals in chunks.")
+
+    option_list = BaseCommand.option_list + (
+        make_option('--chunk-size', type='int', default=500,
+                    help='Number of goals loaded per chunk (default 500).'),
+        make_option('--stale-only', action='store_true', default=False,
+                    help='Only process goals whose neighbours have never been found.'),
+    )
+
+    def handle(self, *args, **options):
+        goals = BucketListItem.objects.order_by('id')
+        if options['stale_only']:
+            goals = goals.filter(neighbours_seen_id=0)
+        total = goals.count()
+        done = 0
+        last_id = 0
+        start = time.time()
+        while True:
+            chunk = list(goals.filter(pk__gt=last_id)[:options['chunk_size']])
+            if not chunk:
+                break
+            for item in chunk:
+                RefreshSimilarGoals(item, rebuild=True)
+            done += len(chunk)
+            last_id = chunk[-1].id
+            self.stdout.write("%s/%s goals done (%.0fs)" % (done, total, time.time() - start))
@@ -0,0 +1,24 @@
+from optparse import make_option
+
+from django.core.management.base import BaseCommand
+
+from BucketList.recommendation_cache import RecommendationCacheStats, ResetRecommendationCacheStats
+
+
+class Command(BaseCommand):
+    help = ("Shows the recommendation page cache hits, misses and hit rate. "
+            "Server processes add their counts to the shared counters every "
+            "RECOMMENDATION_STATS_FLUSH_INTERVAL seconds, so the most recent "
+            "ones are missing.")
+
+    option_list = BaseCommand.option_list + (
+        make_option('--reset', action='store_true', default=False,
+                    help='Set both counters back to zero after showing them.'),
+    )
+
+    def handle(self, *args, **options):
+        stats = RecommendationCacheStats()
+        self.stdout.write("Hits: %(hits)s, misses: %(misses)s, hit rate: %(hit_rate).1f%%" % stats)
+        if options['reset']:
+            ResetRecommendationCacheStats()
+            self.stdout.write("Counters reset.")
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+from south.utils import datetime_utils as datetime
+from south.db import db
+from south.v2 import SchemaMigration
+from django.db import models
+
+
+class Migration(SchemaMigration):
+
+    def forwards(self, orm):
+        # Adding model 'GoalToken'
+        db.create_table(u'BucketList_goaltoken', (
+            (u'id', self.gf('django.db.models.fields.AutoField')(primary_key=True)),
+            ('token', self.gf('django.db.models.fields.CharField')(max_length=70, db_index=True)),
+            ('item', self.gf('django.db.models.fields.related.ForeignKey')(to=orm['BucketList.BucketListItem'])),
+        ))
+        db.send_create_signal(u'BucketList', ['GoalToken'])
+
+        # Adding unique constraint on 'GoalToken', fields ['token', 'item']
+        db.create_unique(u'BucketList_goaltoken', ['token', 'item_id'])
+
+    def backwards(self, orm):
+        # Removing unique constraint on 'GoalToken', fields ['token', 'item']
+        db.delete_unique(u'BucketList_goaltoken', ['token', 'item_id'])
+
+        # Deleting model 'GoalToken'
+        db.delete_table(u'BucketList_goaltoken')
+
+    models = {
+        u'BucketList.bucketlistitem': {
+            'Meta': {'object_name': 'BucketListItem'},
+            'cost': ('django.db.models.fields.IntegerField', [], {'default': '0'}),
+            'crossed_off': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'goal_type': ('django.db.models.fields.CharField', [], {'max_length': '50'}),
+            'hours': ('django.db.models.fields.IntegerField', [], {'default': '0'}),
+            'how_many_items': ('django.db.models.fields.IntegerField', [], {'default': '1'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'pub_by': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['auth.User']"}),
+            'pub_date': ('django.db.models.fields.DateTimeField', [], {}),
+            'text': ('django.db.models.fields.CharField', [], {'max_length': '70'}),
+            'time': ('django.db.models.fields.IntegerField', [], {'default': '0'})
+        },
+        u'BucketList.comment': {
+            'Meta': {'object_name': 'Comment'},
+            'author': ('django.db.models.fields.CharField', [], {'max_length': '200'}),
+            'body': ('django.db.models.fields.TextField', [], {}),
+            'created': ('django.db.models.fields.DateTimeField', [], {}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'item': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['BucketList.BucketListItem']"})
+        },
+        u'BucketList.goaltoken': {
+            'Meta': {'unique_together': "(('token', 'item'),)", 'object_name': 'GoalToken'},
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'item': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['BucketList.BucketListItem']"}),
+            'token': ('django.db.models.fields.CharField', [], {'max_length': '70', 'db_index': 'True'})
+        },
+        u'BucketList.useractivity': {
+            'Meta': {'object_name': 'UserActivity'},
+            'comments_authored': ('django.db.models.fields.IntegerField', [], {'default': '0'}),
+            'comments_received': ('django.db.models.fields.IntegerField', [], {'default': '0'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'items_created': ('django.db.models.fields.IntegerField', [], {'default': '0'}),
+            'items_crossed_off': ('django.db.models.fields.IntegerField', [], {'default': '0'}),
+            'score': ('django.db.models.fields.IntegerField', [], {'default': '0', 'db_index': 'True'}),
+            'user': ('django.db.models.fields.related.OneToOneField', [], {'to': u"orm['auth.User']", 'unique': 'True'})
+        },
+        u'BucketList.userprofile': {
+            'Meta': {'object_name': 'UserProfile'},
+            'birth_date': ('django.db.models.fields.DateField', [], {'default': 'datetime.datetime.now'}),
+            'hourly_wage': ('django.db.models.fields.FloatField', [], {'default': '0'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'include_retirement': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'life_expectancy': ('django.db.models.fields.IntegerField', [], {'default': '0'}),
+            'retirement': ('django.db.models.fields.IntegerField', [], {'default': '0'}),
+            'retirement_savings': ('django.db.models.fields.IntegerField', [], {'default': '0'}),
+            'user': ('django.db.models.fields.related.OneToOneField', [], {'to': u"orm['auth.User']", 'unique': 'True'}),
+            'yearly_earnings': ('django.db.models.fields.IntegerField', [], {'default': '0'})
+        },
+        u'auth.group': {
+            'Meta': {'object_name': 'Group'},
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '80'}),
+            'permissions': ('django.db.models.fields.related.ManyToManyField', [], {'to': u"orm['auth.Permission']", 'symmetrical': 'False', 'blank': 'True'})
+        },
+        u'auth.permission': {
+            'Meta': {'ordering': "(u'content_type__app_label', u'content_type__model', u'codename')", 'unique_together': "((u'content_type', u'codename'),)", 'object_name': 'Permission'},
+            'codename': ('django.db.models.fields.CharField', [], {'max_length': '100'}),
+            'content_type': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['contenttypes.ContentType']"}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '50'})
+        },
+        u'auth.user': {
+            'Meta': {'object_name': 'User'},
+            'date_joined': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now'}),
+            'email': ('django.db.models.fields.EmailField', [], {'max_length': '75', 'blank': 'True'}),
+            'first_name': ('django.db.models.fields.CharField', [], {'max_length': '30', 'blank': 'True'}),
+            'groups': ('django.db.models.fields.related.ManyToManyField', [], {'symmetrical': 'False', 'related_name': "u'user_set'", 'blank': 'True', 'to': u"orm['auth.Group']"}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'is_active': ('django.db.models.fields.BooleanField', [], {'default': 'True'}),
+            'is_staff': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'is_superuser': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'last_login': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now'}),
+            'last_name': ('django.db.models.fields.CharField', [], {'max_length': '30', 'blank': 'True'}),
+            'password': ('django.db.models.fields.CharField', [], {'max_length': '128'}),
+            'user_permissions': ('django.db.models.fields.related.ManyToManyField', [], {'symmetrical': 'False', 'related_name': "u'user_set'", 'blank': 'True', 'to': u"orm['auth.Permission']"}),
+            'username': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '30'})
+        },
+        u'contenttypes.contenttype': {
+            'Meta': {'ordering': "('name',)", 'unique_together': "(('app_label', 'model'),)", 'object_name': 'ContentType', 'db_table': "'django_content_type'"},
+            'app_label': ('django.db.models.fields.CharField', [], {'max_length': '100'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'model': ('django.db.models.fields.CharField', [], {'max_length': '100'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '100'})
+        }
+    }
+
+    complete_apps = ['BucketList']
\ No newline at end of file
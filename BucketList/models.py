@@ -1,13 +1,16 @@
-from django.db import models
+from django.db import models, IntegrityError, transaction
 from django.utils import timezone
 from datetime import timedelta, date, datetime
 from django.contrib.auth.models import User
 from django.core.signals import request_finished
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_save, pre_save, post_delete, pre_delete
 from django.dispatch import receiver
+from django.db.models import F
 from Bucket.forms import MyRegistrationForm, UserCreationForm
 from validators import validate_positive
+from BucketList.recommendation import GoalDifficulty, HOURS_PER_GOAL_DAY
 from django import forms
+import hashlib
 
 
 def FindAge(born):
@@ -23,6 +26,12 @@ def FindAge(born):
     else:
         return today.year - born.year
 
+
+def GoalTextHash(text):
+    #Takes the text of a goal and outputs a hash of it ignoring case and extra spaces, goals with the same hash are the exact same goal
+    normalized = u' '.join(text.lower().split())
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+    
         
 CHOICES = (
     ('Travel','Travel'),
@@ -52,6 +61,11 @@ class BucketListItem(models.Model):
     hours = models.IntegerField(default =0, validators = [validate_positive])
     crossed_off = models.BooleanField(editable = False, default = False)
     how_many_items = models.IntegerField(editable = False, default = 1)
+    text_hash = models.CharField(max_length = 40, editable = False, default = '', db_index = True)
+    #Highest goal id already compared when finding this goals GoalSimilarity neighbours, 0 means they need to be found from scratch
+    neighbours_seen_id = models.IntegerField(editable = False, default = 0)
+    #Hours the goal takes including the hours worked to pay for it at the owners wage, kept up to date so goals can be ordered by it in the database
+    difficulty = models.FloatField(editable = False, default = 0, db_index = True)
         
     def __unicode__(self):
         return self.text
@@ -59,6 +73,10 @@ class BucketListItem(models.Model):
     def save(self):
         if not self.id:
             self.pub_date = timezone.now()
+        text_hash = GoalTextHash(self.text)
+        if text_hash != self.text_hash:
+            self.text_hash = text_hash
+            self.neighbours_seen_id = 0
         super(BucketListItem, self).save()
         
         
@@ -87,13 +105,123 @@ class UserProfile(models.Model):
 class Comment(models.Model):
     #Model that defines the Commenting system
     created = models.DateTimeField(editable =False)
-    author = models.CharField(max_length = 200, editable = False)
+    author = models.CharField(max_length = 200, editable = False, db_index = True)
     body = models.TextField()
     item = models.ForeignKey(BucketListItem)
     
     def __unicode__(self):
         return self.body
         
+        
+        
+class GoalToken(models.Model):
+    #Inverted search index, one row for every normalized word of a BucketListItems text
+    token = models.CharField(max_length = 70, db_index = True)
+    item = models.ForeignKey(BucketListItem)
+    
+    class Meta:
+        unique_together = (('token', 'item'),)
+        
+    def __unicode__(self):
+        return self.token
+        
+        
+class GoalTrigram(models.Model):
+    #Fuzzy search index, one row for every three letter sequence in a BucketListItems words
+    trigram = models.CharField(max_length = 3, db_index = True)
+    item = models.ForeignKey(BucketListItem)
+    
+    class Meta:
+        unique_together = (('trigram', 'item'),)
+        
+    def __unicode__(self):
+        return self.trigram
+        
+        
+class UsernameTrigram(models.Model):
+    #Fuzzy search index, one row for every three letter sequence in a Users username
+    trigram = models.CharField(max_length = 3, db_index = True)
+    user = models.ForeignKey(User)
+    
+    class Meta:
+        unique_together = (('trigram', 'user'),)
+        
+    def __unicode__(self):
+        return self.trigram
+        
+        
+class GoalSimilarity(models.Model):
+    #Model that stores the most similar goals of other users for each BucketListItem along with their FuzzyWuzzy similarity
+    item = models.ForeignKey(BucketListItem, related_name = 'similar_goals')
+    neighbour = models.ForeignKey(BucketListItem, related_name = '+')
+    similarity = models.IntegerField()
+    
+    class Meta:
+        unique_together = (('item', 'neighbour'),)
+        
+    def __unicode__(self):
+        return u'%s ~ %s' % (self.item_id, self.neighbour_id)
+        
+        
+class GoalTypeTotals(models.Model):
+    #Model that stores the running count and cost, hours and time sums of every goal of a goal type, open and crossed off goals are kept apart so site wide averages do not need a scan of every goal
+    goal_type = models.CharField(choices = CHOICES, max_length = 50)
+    crossed_off = models.BooleanField(default = False)
+    count = models.IntegerField(default = 0)
+    cost = models.BigIntegerField(default = 0)
+    hours = models.BigIntegerField(default = 0)
+    time = models.BigIntegerField(default = 0)
+    
+    class Meta:
+        unique_together = (('goal_type', 'crossed_off'),)
+        
+    def __unicode__(self):
+        return u'%s (%s)' % (self.goal_type, self.count)
+        
+        
+def ActivityScore(items_created, items_crossed_off, comments_authored, comments_received):
+    #Weighs each site action and outputs a single activity score, comments received from other users carry the most weight
+    return items_created*1 + items_crossed_off*1 + comments_authored*2 + comments_received*5
+    
+    
+class UserActivity(models.Model):
+    #Model that stores each Users activity counters so the leaderboard does not have to count them on every page view
+    user = models.OneToOneField(User, editable = False)
+    items_created = models.IntegerField(default = 0)
+    items_crossed_off = models.IntegerField(default = 0)
+    comments_authored = models.IntegerField(default = 0)
+    comments_received = models.IntegerField(default = 0)
+    score = models.IntegerField(default = 0, db_index = True)
+    
+    def __unicode__(self):
+        return unicode(self.user)
+        
+        
+def UpdateUserActivity(user, goals = True, comments = True):
+    #Takes a User and recounts their goal counters, their comment counters or both and their score, creates the UserActivity row if the user does not have one yet.  When another request creates it at the same time the row it created is used
+    if user is None:
+        return
+    try:
+        with transaction.atomic():
+            activity, created = UserActivity.objects.get_or_create(user = user)
+    except IntegrityError:
+        activity = UserActivity.objects.get(user = user)
+    if goals:
+        activity.items_created = BucketListItem.objects.filter(pub_by = user).count()
+        activity.items_crossed_off = BucketListItem.objects.filter(pub_by = user, crossed_off = True).count()
+    if comments:
+        activity.comments_authored = Comment.objects.filter(author = user.username).count()
+        activity.comments_received = Comment.objects.filter(item__pub_by = user).exclude(author = user.username).count()
+    activity.score = ActivityScore(activity.items_created, activity.items_crossed_off, activity.comments_authored, activity.comments_received)
+    activity.save()
+    
+    
+def UpdateGoalDifficulties(user_id, wage):
+    #Takes a user id and their new hourly wage and recomputes the difficulty of every one of their goals with a single UPDATE, the same formula as GoalDifficulty
+    difficulty = F('time')*HOURS_PER_GOAL_DAY + F('hours')
+    if wage:
+        difficulty = difficulty + F('cost')/float(wage)
+    BucketListItem.objects.filter(pub_by = user_id).update(difficulty = difficulty)
     
     
 @receiver(post_save, sender = User)
@@ -101,6 +229,137 @@ def my_callback(sender, instance, created, **kwargs):
     #Watches for User Creation then automatically creates a UserProfile for the User Created
     if created:
         UserProfile.objects.create(user = instance)
+        UserActivity.objects.create(user = instance)
+        
+        
+@receiver(post_save, sender = BucketListItem)
+@receiver(post_delete, sender = BucketListItem)
+def bucket_list_item_activity(sender, instance, **kwargs):
+    #Keeps the publishers activity counters up to date whenever one of their goals is created, crossed off, or deleted
+    from BucketList.leaderboard import ScheduleLeaderboardRefresh
+    UpdateUserActivity(User.objects.filter(pk = instance.pub_by_id).first(), comments = False)
+    ScheduleLeaderboardRefresh()
+    
+    
+@receiver(pre_save, sender = BucketListItem)
+def bucket_list_item_totals_before(sender, instance, **kwargs):
+    #Remembers which GoalTypeTotals row a goal counted towards before it is saved so its values can be moved out of it
+    from BucketList.aggregates import RememberGoalTotals
+    RememberGoalTotals(instance)
+    
+    
+@receiver(post_save, sender = BucketListItem)
+def bucket_list_item_totals(sender, instance, **kwargs):
+    #Moves a goals cost, hours and time to its new GoalTypeTotals row whenever it is created, edited, or crossed off
+    from BucketList.aggregates import UpdateGoalTypeTotals
+    UpdateGoalTypeTotals(instance)
+    
+    
+@receiver(post_delete, sender = BucketListItem)
+def bucket_list_item_totals_deleted(sender, instance, **kwargs):
+    #Takes a deleted goals cost, hours and time out of its GoalTypeTotals row
+    from BucketList.aggregates import UpdateGoalTypeTotals
+    UpdateGoalTypeTotals(instance, deleted = True)
+    
+    
+@receiver(post_save, sender = BucketListItem)
+def bucket_list_item_difficulty(sender, instance, **kwargs):
+    #Stores a goals difficulty when it is created or its cost, hours or days change, read from the values bucket_list_item_totals_before remembered so other saves cost no query
+    before = getattr(instance, '_goal_totals_before', None)
+    if before is None or before[1] != (instance.cost, instance.hours, instance.time):
+        wage = UserProfile.objects.filter(user = instance.pub_by_id).values_list('hourly_wage', flat = True).first()
+        instance.difficulty = GoalDifficulty(instance.cost, instance.hours, instance.time, wage)
+        #update() so the goals own save signals do not run again
+        BucketListItem.objects.filter(pk = instance.pk).update(difficulty = instance.difficulty)
+    
+    
+@receiver(post_save, sender = BucketListItem)
+@receiver(post_delete, sender = BucketListItem)
+def bucket_list_item_recommendation_cache(sender, instance, **kwargs):
+    #Makes the publishers cached recommendation page stale, and every users page when the goal moved the site wide averages far enough.  Runs after the GoalTypeTotals receivers so it sees the new totals
+    from BucketList.recommendation_cache import BumpRecommendationVersion, CheckSiteAverages
+    BumpRecommendationVersion(instance.pub_by_id)
+    CheckSiteAverages()
+    
+    
+@receiver(pre_save, sender = UserProfile)
+def user_profile_wage_before(sender, instance, **kwargs):
+    #Remembers the hourly wage a profile had before it is saved so goal difficulties are only recomputed when it changes
+    instance._hourly_wage_before = UserProfile.objects.filter(pk = instance.pk).values_list('hourly_wage', flat = True).first() if instance.pk else None
+    
+    
+@receiver(post_save, sender = UserProfile)
+def user_profile_goal_difficulties(sender, instance, created, **kwargs):
+    #Recomputes the difficulty of every goal of the user in one UPDATE whenever their hourly wage changes
+    if not created and instance.hourly_wage != getattr(instance, '_hourly_wage_before', None):
+        UpdateGoalDifficulties(instance.user_id, instance.hourly_wage)
+        
+        
+@receiver(post_save, sender = UserProfile)
+@receiver(post_delete, sender = UserProfile)
+def user_profile_recommendation_cache(sender, instance, **kwargs):
+    #Makes the users cached recommendation page stale whenever their profile changes
+    from BucketList.recommendation_cache import BumpRecommendationVersion
+    BumpRecommendationVersion(instance.user_id)
+    
+    
+@receiver(post_save, sender = BucketListItem)
+@receiver(post_delete, sender = BucketListItem)
+def bucket_list_item_sidebars(sender, instance, **kwargs):
+    #Makes the cached Recently Added, Recently Completed and Talked About sidebars stale whenever a goal is created, edited, crossed off, or deleted
+    from BucketList.sidebar import BumpSidebarVersion, GOALS_VERSION_KEY
+    BumpSidebarVersion(GOALS_VERSION_KEY)
+    
+    
+@receiver(post_save, sender = BucketListItem)
+def bucket_list_item_search_index(sender, instance, **kwargs):
+    #Re-indexes the goals words whenever it is saved, its GoalTokens and GoalTrigrams are removed along with it when it is deleted
+    from BucketList.search import IndexGoal
+    IndexGoal(instance)
+    
+    
+@receiver(post_save, sender = BucketListItem)
+def bucket_list_item_similar_goals(sender, instance, created, **kwargs):
+    #Schedules finding the neighbours of a goal when it is created or its text is edited, goals that had the edited goal as a neighbour are marked to be found again.  The scoring runs in the background, a page that needs them first finds them itself
+    from BucketList.similarity import ScheduleSimilarGoalsRefresh
+    if instance.neighbours_seen_id == 0:
+        if not created:
+            BucketListItem.objects.filter(similar_goals__neighbour = instance).update(neighbours_seen_id = 0)
+        ScheduleSimilarGoalsRefresh()
+        
+        
+@receiver(pre_delete, sender = BucketListItem)
+def bucket_list_item_lost_neighbour(sender, instance, **kwargs):
+    #Goals that had the deleted goal as a neighbour are marked to be found again
+    BucketListItem.objects.filter(similar_goals__neighbour = instance).update(neighbours_seen_id = 0)
+    
+    
+@receiver(post_save, sender = User)
+def user_search_index(sender, instance, **kwargs):
+    #Re-indexes the username whenever a User is saved
+    from BucketList.search import IndexUsername
+    IndexUsername(instance)
+    
+    
+@receiver(post_save, sender = Comment)
+@receiver(post_delete, sender = Comment)
+def comment_sidebars(sender, instance, **kwargs):
+    #Makes the cached Talked About sidebars stale whenever a comment is made or deleted
+    from BucketList.sidebar import BumpSidebarVersion, COMMENTS_VERSION_KEY
+    BumpSidebarVersion(COMMENTS_VERSION_KEY)
+    
+    
+@receiver(post_save, sender = Comment)
+@receiver(post_delete, sender = Comment)
+def comment_activity(sender, instance, **kwargs):
+    #Keeps the activity counters of the comment author and the goal owner up to date.  The goal is looked up by id because it may already be deleted when comments are removed along with it
+    from BucketList.leaderboard import ScheduleLeaderboardRefresh
+    author = User.objects.filter(username = instance.author).first()
+    owner = User.objects.filter(bucketlistitem__pk = instance.item_id).first()
+    UpdateUserActivity(author, goals = False)
+    if owner is not None and owner != author:
+        UpdateUserActivity(owner, goals = False)
+    ScheduleLeaderboardRefresh()
 
 
         
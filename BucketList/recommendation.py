@@ -0,0 +1,452 @@
+import heapq
+import math
+
+import numpy as np
+
+
+#Hours of each day a goal takes that count towards its difficulty, the rest is sleep and free time
+HOURS_PER_GOAL_DAY = 17
+
+#Number of goals shown in the most and least difficult lists
+DIFFICULTY_LIST_LENGTH = 5
+
+#Yearly raises the salary projections are shown for
+SALARY_GROWTH_RATES = (0.01, 0.02, 0.03, 0.04, 0.05)
+
+#Years added to or taken from the users end date in the Your End Date table, 0 is the users own end date
+END_DATE_OFFSETS = (-20, -15, -10, -5, 0, 5, 10, 15, 20)
+
+#Yearly returns on retirement savings the Retirement tab is shown for, the key is the percent used in the template names
+RETIREMENT_RATES = ((4, 0.04), (5, 0.05), (6, 0.06), (7, 0.07), (8, 0.08), (9, 0.09))
+
+#Historical yearly inflation
+INFLATION_RATE = 0.03
+
+#How far a years return on retirement savings and a years inflation typically move away from their average, used by the retirement simulation
+RETURN_VOLATILITY = 0.12
+INFLATION_VOLATILITY = 0.01
+
+#Number of return and inflation paths the retirement simulation follows, the seed keeps a users page the same every time it is computed
+RETIREMENT_SIMULATION_PATHS = 10000
+RETIREMENT_SIMULATION_SEED = 0
+
+#Percentiles of the simulated savings returned for every year until retirement
+RETIREMENT_PERCENTILES = (10, 25, 50, 75, 90)
+
+#Share of income saved every year for the earliest retirement age and the return needed on the Retirement tabs
+RETIREMENT_SAVINGS_RATE = 0.10
+
+#Oldest retirement age and highest yearly return the retirement solvers look up to
+LATEST_RETIREMENT_AGE = 100
+HIGHEST_RETURN = 1.0
+
+#Goal types compared on the Comparing Goal Types tabs in the order they are shown, with the id of their tab
+GOAL_TYPE_TABS = (('Career', 'career'), ('Purchase', 'purchase'), ('Travel', 'travel'), ('Extreme Sport', 'extreme'),
+                  ('Family/Social', 'family'), ('Relationship', 'relationship'), ('Exercise/Health', 'exercise'),
+                  ('Improving a Skill', 'skill'), ('Hobby', 'hobby'), ('Building/Creating Something', 'building'),
+                  ('Education/Self Improvement', 'education'), ('Volunteering', 'volunteering'))
+
+
+def GoalArrays(goals):
+    #Takes BucketListItems, or anything else with cost, hours and time, and returns their costs, hours and days as float arrays
+    goals = list(goals)
+    costs = np.fromiter((goal.cost for goal in goals), dtype = float, count = len(goals))
+    hours = np.fromiter((goal.hours for goal in goals), dtype = float, count = len(goals))
+    times = np.fromiter((goal.time for goal in goals), dtype = float, count = len(goals))
+    return costs, hours, times
+
+
+def ValueArrays(rows):
+    #Takes (cost, hours, time) rows, like the ones values_list returns, and returns them as three float arrays
+    values = np.array(list(rows), dtype = float).reshape(-1, 3)
+    return values[:, 0], values[:, 1], values[:, 2]
+
+
+def _ratio(numerator, denominator):
+    if denominator == 0:
+        return 0.0
+    return float(numerator)/denominator
+
+
+def GoalDifficulty(cost, hours, time, wage):
+    #Takes the cost, hours and days of one goal and its owners hourly wage and returns its difficulty like GoalDifficulties, the cost is left out while the wage is not filled in
+    difficulty = float(time)*HOURS_PER_GOAL_DAY + hours
+    if wage:
+        difficulty += float(cost)/wage
+    return difficulty
+
+
+def GoalDifficulties(costs, hours, times, wage):
+    #Takes the costs, hours and days of goals and the users hourly wage and returns how difficult each goal is as the total number of hours it takes, cost is turned into the hours worked to pay for it
+    return times*HOURS_PER_GOAL_DAY + costs/float(wage) + hours
+
+
+def DifficultyRanking(difficulty, ids, count = DIFFICULTY_LIST_LENGTH):
+    #Takes the difficulty and id of each goal and returns the positions of all the goals from most to least difficult and of the count most and least difficult goals.  Goals are told apart by id so goals with the same difficulty or text always come out in the same order, the lowest id first.  The full order is one sort, the short lists come from heaps
+    keys = list(zip(difficulty.tolist(), ids))
+    positions = range(len(keys))
+    order = sorted(positions, key = lambda position: (-keys[position][0], keys[position][1]))
+    most = heapq.nsmallest(count, positions, key = lambda position: (-keys[position][0], keys[position][1]))
+    least = heapq.nsmallest(count, positions, key = lambda position: keys[position])
+    return order, most, least
+
+
+def SalaryProjections(yearly_earnings, total_cost, horizons, rates = SALARY_GROWTH_RATES):
+    #Takes the yearly earnings, the total cost of the users goals, the years to project over and the yearly raises and returns the final salary, the total earned and the percent of it the goals take for every raise and number of years.  Each is a (rates, horizons) array worked out from the geometric series sums so no year is looped over, the current year counts towards the total earned
+    rates = np.asarray(rates, dtype = float)[:, np.newaxis]
+    horizons = np.floor(np.asarray(horizons, dtype = float))[np.newaxis, :]
+    growth = 1 + rates
+    final_salary = yearly_earnings*growth**horizons
+    years_earned = np.maximum(horizons, 0) + 1
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+        total_earnings = yearly_earnings*np.where(rates == 0, years_earned, (growth**years_earned - 1)/rates)
+        percent_of_earnings = total_cost/total_earnings*100
+    return final_salary, total_earnings, percent_of_earnings
+
+
+def EndDateSweep(years_left, total_cost, total_number_of_items, total_time, total_hours, offsets = END_DATE_OFFSETS):
+    #Takes the years left, the totals of the users goals and any number of years to add to or take from the years left and returns the years left, cost per year, days per goal, days per year and hours per month for each offset as arrays, along with a mask of the offsets whose end date is still ahead.  The values of end dates that are not ahead are nan, a range of offsets gives the points of a chart
+    years = years_left + np.asarray(offsets, dtype = float)
+    valid = years > 0
+    usable_years = np.where(valid, years, np.nan)
+    return {
+        'years_left': years,
+        'valid': valid,
+        'cost_per_year': total_cost/usable_years,
+        'days_per_goal': usable_years*365/total_number_of_items,
+        'days_per_year': total_time/usable_years,
+        'hours_per_month': total_hours/usable_years/12,
+    }
+
+
+def RetirementNeeds(current_age, retirement_age, savings, retirement_income, rates):
+    #Takes the users age, retirement age, savings, yearly income wanted in retirement and yearly returns and outputs for each return the amount needed at retirement and the amount that has to be saved per year
+    rates = np.asarray(rates, dtype = float)
+    years_left = retirement_age - current_age
+    amount_needed = retirement_income/rates
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+        save_per_year = (amount_needed - savings*(1 + rates)**years_left)/(((1 + rates)**years_left - 1)/rates)
+    return amount_needed, save_per_year
+
+
+def _sorted_percentiles(sorted_rows, percentiles):
+    #Takes rows that are each sorted and returns the given percentiles of every row as a (percentiles, rows) array, interpolating between the two nearest values like np.percentile without its partitioning cost
+    positions = np.asarray(percentiles, dtype = float)/100*(sorted_rows.shape[1] - 1)
+    below = np.floor(positions).astype(int)
+    above = np.minimum(below + 1, sorted_rows.shape[1] - 1)
+    fraction = positions - below
+    return (sorted_rows[:, below]*(1 - fraction) + sorted_rows[:, above]*fraction).T
+
+
+def RetirementShortfall(years, savings, save_per_year, yearly_earnings, rate):
+    #Takes a number of years to retirement, the savings, yearly savings, yearly earnings and yearly return and returns how much more is saved at retirement than is needed for the returns alone to pay the inflated earnings, negative when there is not enough.  This is the closed form RetirementNeeds is solved from
+    growth = (1 + rate)**years
+    saved = savings*growth + save_per_year*(growth - 1)/rate
+    return saved - yearly_earnings*(1 + INFLATION_RATE)**years/rate
+
+
+def _bisect(function, low, high, tolerance = 1e-9):
+    #Takes a function that is negative at low and not negative at high and returns the point where it crosses zero to within the tolerance
+    while high - low > tolerance:
+        middle = (low + high)/2
+        if function(middle) < 0:
+            low = middle
+        else:
+            high = middle
+    return high
+
+
+def EarliestRetirementAge(current_age, savings, save_per_year, yearly_earnings, rate, latest_age = LATEST_RETIREMENT_AGE):
+    #Takes the users age, savings, yearly savings, yearly earnings and yearly return and returns the earliest whole age they could retire at, None when they could not by latest_age.  The age is found by bisection over the years, savings are assumed to keep up with the needed amount once they have caught up with it which holds whenever the return beats inflation
+    shortfall = lambda years: RetirementShortfall(years, savings, save_per_year, yearly_earnings, rate)
+    most_years = latest_age - current_age
+    if shortfall(0) >= 0:
+        return current_age
+    if most_years <= 0 or shortfall(most_years) < 0:
+        return None
+    years = _bisect(shortfall, 0.0, float(most_years))
+    whole_years = int(math.floor(years))
+    if shortfall(whole_years) < 0:
+        whole_years += 1
+    return current_age + whole_years
+
+
+def RequiredReturn(current_age, retirement_age, savings, save_per_year, yearly_earnings, highest = HIGHEST_RETURN):
+    #Takes the users age, retirement age, savings, yearly savings and yearly earnings and returns the yearly return needed to retire at that age, None when even the highest return is not enough.  More return always leaves less of a shortfall so it is found by bisection
+    years = retirement_age - current_age
+    shortfall = lambda rate: RetirementShortfall(years, savings, save_per_year, yearly_earnings, rate)
+    if years < 0 or shortfall(highest) < 0:
+        return None
+    return _bisect(shortfall, 1e-6, highest)
+
+
+def RetirementSimulation(current_age, retirement_age, savings, save_per_year, yearly_earnings, mean_returns,
+                         paths = RETIREMENT_SIMULATION_PATHS, seed = RETIREMENT_SIMULATION_SEED):
+    #Takes the users age, retirement age, savings, yearly earnings and for each of several average yearly returns the amount saved every year, and follows that many random return and inflation paths to retirement for every return at once.  Returns for each return the share of paths whose savings can pay the inflated earnings out of that return alone and the RETIREMENT_PERCENTILES of the savings at retirement as a (percentiles, returns) array.  Every return sees the same random years so they differ only by their average, savings are added at the end of each year and only the balance at retirement is kept.  Only the total inflation of each path matters so it is drawn once per path from the lognormal it approximately follows
+    years = max(int(retirement_age - current_age), 0)
+    mean_returns = np.asarray(mean_returns, dtype = float)[:, np.newaxis]
+    save_per_year = np.maximum(np.asarray(save_per_year, dtype = float), 0)[:, np.newaxis]
+    random = np.random.RandomState(seed)
+    shocks = RETURN_VOLATILITY*random.standard_normal((years, paths))
+    inflation_spread = INFLATION_VOLATILITY/(1 + INFLATION_RATE)
+    total_inflation = np.exp(years*(np.log1p(INFLATION_RATE) - inflation_spread**2/2) +
+                             np.sqrt(years)*inflation_spread*random.standard_normal(paths))
+    balances = np.empty((len(mean_returns), paths))
+    balances.fill(savings)
+    growth = np.empty_like(balances)
+    for shock in shocks:
+        np.add(1 + mean_returns, shock, out = growth)
+        balances *= growth
+        #A path that lost everything in a year has nothing left to grow
+        np.maximum(balances, 0, out = balances)
+        balances += save_per_year
+    needed = yearly_earnings*total_inflation/mean_returns
+    success_probability = np.count_nonzero(balances >= needed, axis = 1)/float(paths)
+    balances.sort(axis = 1)
+    return {
+        'success_probability': success_probability,
+        'percentiles': RETIREMENT_PERCENTILES,
+        'final_bands': _sorted_percentiles(balances, RETIREMENT_PERCENTILES),
+    }
+
+
+def PercentileRanks(sorted_values, values):
+    #Takes the sorted values of every open goal and returns for each of the given values the percent of the other goals with a smaller value, each found with a binary search.  The sorted values come from the cached GoalDistributions, so a goal added since is not in them and would rank above all of them, the ranks are capped at 100
+    other_goals = len(sorted_values) - 1
+    if other_goals < 1:
+        return np.zeros(len(values))
+    return np.minimum(np.searchsorted(sorted_values, values, side = 'left')*100.0/other_goals, 100.0)
+
+
+def _largest_in_group(codes, values, number_of_groups):
+    #Returns the position of the largest value in each group, -1 for empty groups.  Ties go to the earliest position
+    largest = np.full(number_of_groups, -1, dtype = int)
+    order = np.lexsort((-values, codes))
+    groups, first = np.unique(codes[order], return_index = True)
+    largest[groups] = order[first]
+    return largest
+
+
+def GoalTypeStats(goals, goal_types, costs, hours, times, all_users_averages):
+    #Takes the users goals with their goal type, cost, hours and days arrays and a dict of every users average (cost, hours, time) by goal type and returns a dict for each GOAL_TYPE_TABS goal type the user has.  Each has the users goal count and averages, every users averages and the users goals with the largest cost, hours and days
+    names = [name for name, tab in GOAL_TYPE_TABS]
+    positions = dict((name, number) for number, name in enumerate(names))
+    codes = np.fromiter((positions.get(goal_type, -1) for goal_type in goal_types), dtype = int, count = len(goal_types))
+    shown = codes >= 0
+    codes, costs, hours, times = codes[shown], costs[shown], hours[shown], times[shown]
+    goals = [goal for goal, is_shown in zip(goals, shown) if is_shown]
+
+    counts = np.bincount(codes, minlength = len(names))
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+        averages = [np.nan_to_num(np.bincount(codes, weights = values, minlength = len(names))/counts)
+                    for values in (costs, hours, times)]
+    largest = [_largest_in_group(codes, values, len(names)) for values in (costs, hours, times)]
+
+    goal_type_stats = []
+    for number, (name, tab) in enumerate(GOAL_TYPE_TABS):
+        if not counts[number]:
+            continue
+        all_users_cost, all_users_hours, all_users_time = all_users_averages.get(name, (0, 0, 0))
+        goal_type_stats.append({
+            'name': name,
+            'tab': tab,
+            'count': int(counts[number]),
+            'cost': float(averages[0][number]),
+            'hours': float(averages[1][number]),
+            'time': float(averages[2][number]),
+            'all_users_cost': float(all_users_cost or 0),
+            'all_users_hours': float(all_users_hours or 0),
+            'all_users_time': float(all_users_time or 0),
+            'largest_cost': goals[largest[0][number]],
+            'largest_hours': goals[largest[1][number]],
+            'largest_days': goals[largest[2][number]],
+        })
+    return goal_type_stats
+
+
+def RetirementStats(age, life_expectancy, yearly_earnings, retirement, retirement_savings, percent_of_yearly_wage,
+                    paths = RETIREMENT_SIMULATION_PATHS):
+    #Takes the users age, life expectancy, yearly earnings, retirement age, retirement savings and the percent of their income their goals take and outputs the numbers for the Retirement section, every return is simulated in one call over that many paths
+    yearly_income_at_retirement = yearly_earnings*(1 + INFLATION_RATE)**(retirement - age)
+    if retirement == life_expectancy:
+        under_over_same = 0
+    elif retirement > life_expectancy:
+        under_over_same = 1
+    else:
+        under_over_same = 2
+    stats = {
+        'yearly_income_at_retirement': yearly_income_at_retirement,
+        'under_over_same': under_over_same,
+        'retirement_end_date_difference': abs(retirement - life_expectancy),
+        'retirement_simulation_paths': paths,
+    }
+    #Inverse questions at RETIREMENT_SAVINGS_RATE of the current income, the earliest age to retire at each return and the return needed to retire at the users retirement age
+    savings_at_rate = yearly_earnings*RETIREMENT_SAVINGS_RATE
+    return_needed = RequiredReturn(age, retirement, retirement_savings, savings_at_rate, yearly_earnings)
+    stats.update({
+        'retirement_savings_rate': RETIREMENT_SAVINGS_RATE*100,
+        'savings_at_rate': savings_at_rate,
+        'latest_retirement_age': LATEST_RETIREMENT_AGE,
+        'return_needed_for_retirement': return_needed*100 if return_needed is not None else None,
+    })
+    rates = [rate for percent, rate in RETIREMENT_RATES]
+    amount_needed, save_per_year = RetirementNeeds(age, retirement, retirement_savings, yearly_income_at_retirement, rates)
+    simulation = RetirementSimulation(age, retirement, retirement_savings, save_per_year, yearly_earnings, rates, paths = paths)
+    bands = dict(zip(simulation['percentiles'], simulation['final_bands']))
+    for number, ((percent, rate), needed, per_year) in enumerate(zip(RETIREMENT_RATES, amount_needed, save_per_year)):
+        percent_yearly = float(per_year)/yearly_earnings*100
+        stats['retirement_success_%s' % percent] = float(simulation['success_probability'][number])*100
+        stats['retirement_low_%s' % percent] = float(bands[25][number])
+        stats['retirement_high_%s' % percent] = float(bands[75][number])
+        stats['earliest_retirement_age_%s' % percent] = EarliestRetirementAge(age, retirement_savings, savings_at_rate, yearly_earnings, rate)
+        stats['total_needed_for_retirement_%s' % percent] = float(needed)
+        stats['needed_per_year_for_retirement_%s' % percent] = float(per_year)
+        stats['percent_yearly_retirement_%s' % percent] = percent_yearly
+        stats['percent_yearly_retirement_%s_all' % percent] = percent_of_yearly_wage + percent_yearly
+
+    return stats
+
+
+def RecommendationStats(costs, hours, times, age, life_expectancy, yearly_earnings, hourly_wage,
+                        retirement, retirement_savings, include_retirement, all_goal_totals, distributions, ids = None):
+    #Takes the cost, hours and days arrays of the users open goals, the users profile numbers, the (count, cost, hours, time) totals of every open goal on the site, the sorted cost, hours and days of every open goal and the ids of the users goals and returns the recommendation page statistics under their template names.  most_difficult_index, difficulty_order, most_difficult_order and least_difficult_order give the positions of the goals to show, and goal_percentiles the percent of goals each of the users goals costs more, takes more hours and takes more days than.  Without ids goals with the same difficulty keep their order
+    age = float(age)
+    life_expectancy = float(life_expectancy)
+    yearly_earnings = float(yearly_earnings)
+    hourly_wage = float(hourly_wage)
+    retirement = float(retirement)
+    retirement_savings = float(retirement_savings)
+
+    total_cost = float(costs.sum())
+    total_hours = float(hours.sum())
+    total_time = float(times.sum())
+    total_number_of_items = float(len(costs))
+    years_left = life_expectancy - age
+    days_left = years_left*365
+
+    stats = {
+        'total_cost': total_cost,
+        'total_hours': total_hours,
+        'total_time': total_time,
+        'total_number_of_items': total_number_of_items,
+        'age': age,
+        'life_expectancy': life_expectancy,
+        'include_retirement': include_retirement,
+        'retirement': retirement,
+        'retirement_savings': retirement_savings,
+        'years_left': years_left,
+        'yearly_earnings': yearly_earnings,
+        'hourly_wage': hourly_wage,
+        'work_hours_per_week': (yearly_earnings/hourly_wage)/52,
+
+        'accomplish_per_year': total_number_of_items/years_left,
+        'days_per_goal': days_left/total_number_of_items,
+        'cost_per_year': total_cost/years_left,
+        'days_per_year': total_time/years_left,
+        'hours_per_year': total_hours/years_left,
+        'hours_per_month': total_hours/years_left/12,
+        'hours_per_week': total_hours/years_left/52,
+        'cost_of_average_goal': total_cost/total_number_of_items,
+        'percent_of_yearly_wage': (total_cost/years_left/yearly_earnings)*100,
+    }
+    percent_of_yearly_wage = stats['percent_of_yearly_wage']
+
+    #Most Difficult Goal, its Share of the Total Difficulty and How Many Times Harder it is Than the Average Goal
+    difficulty = GoalDifficulties(costs, hours, times, hourly_wage)
+    total_difficulty = float(difficulty.sum())
+    average_goal_difficulty = total_difficulty/total_number_of_items or 1
+    total_difficulty = total_difficulty or 1
+    difficulty_order, most_difficult_order, least_difficult_order = DifficultyRanking(
+        difficulty, ids if ids is not None else range(len(difficulty)))
+    most_difficult_index = most_difficult_order[0]
+    most_difficult_cost = costs[most_difficult_index]
+    most_difficult_hours = hours[most_difficult_index]
+    most_difficult_time = times[most_difficult_index]
+    most_difficult_goal_percentage = float(difficulty[most_difficult_index])/total_difficulty*100
+
+    #How the Users Goals Compare to Every Open Goal, the percentages are of the other goals
+    sorted_costs, sorted_hours, sorted_times = distributions
+    more_cost_than = PercentileRanks(sorted_costs, costs)
+    more_hours_than = PercentileRanks(sorted_hours, hours)
+    more_days_than = PercentileRanks(sorted_times, times)
+    total_number_of_all_goals, cost_of_all_goals, hours_of_all_goals, time_of_all_goals = all_goal_totals
+    average_cost_of_all_goals = _ratio(cost_of_all_goals, total_number_of_all_goals)
+    average_hours_of_all_goals = _ratio(hours_of_all_goals, total_number_of_all_goals)
+    average_time_of_all_goals = _ratio(time_of_all_goals, total_number_of_all_goals)
+
+    stats.update({
+        'total_difficulty': total_difficulty,
+        'most_difficult_index': most_difficult_index,
+        'difficulty_order': difficulty_order,
+        'most_difficult_order': most_difficult_order,
+        'least_difficult_order': least_difficult_order,
+        'most_difficult_goal_percentage': most_difficult_goal_percentage,
+        'most_difficult_percentage_harder': float(difficulty[most_difficult_index])/average_goal_difficulty,
+        'years_needed_for_most_difficult': (most_difficult_goal_percentage*years_left)/100,
+        'total_number_of_all_goals': total_number_of_all_goals,
+        'goal_percentiles': (more_cost_than, more_hours_than, more_days_than),
+        'most_difficult_more_cost_than': float(more_cost_than[most_difficult_index]),
+        'most_difficult_more_hours_than': float(more_hours_than[most_difficult_index]),
+        'most_difficult_more_days_than': float(more_days_than[most_difficult_index]),
+        'average_cost_of_all_goals': average_cost_of_all_goals,
+        'average_hours_of_all_goals': average_hours_of_all_goals,
+        'average_time_of_all_goals': average_time_of_all_goals,
+        'most_difficult_percentage_of_average_cost': _ratio(most_difficult_cost, average_cost_of_all_goals),
+        'most_difficult_percentage_of_average_hours': _ratio(most_difficult_hours, average_hours_of_all_goals),
+        'most_difficult_percentage_of_average_time': _ratio(most_difficult_time, average_time_of_all_goals),
+        'average_goal_average_hours_per_year': average_hours_of_all_goals/52,
+        'most_difficult_average_hours_per_year': float(most_difficult_hours)/52,
+        'most_difficult_percent_of_yearly': float(most_difficult_cost)/yearly_earnings*100,
+    })
+
+    #Analysing Your Yearly Income
+    adjusted_life_expectancy = life_expectancy
+    retirement_less_than_life_expectancy = False
+    if include_retirement and life_expectancy > retirement:
+        adjusted_life_expectancy = retirement
+        retirement_less_than_life_expectancy = True
+    final_salary, total_earnings, percent_of_earnings = SalaryProjections(yearly_earnings, total_cost, [years_left])
+    for number, (salary, percent) in enumerate(zip(final_salary[:, 0], percent_of_earnings[:, 0]), 1):
+        stats['salary_after_compounded_%s' % number] = float(salary)
+        stats['annual_percent_after_compounded_%s' % number] = float(percent)
+    stats.update({
+        'annual_salary_left': yearly_earnings - (yearly_earnings*percent_of_yearly_wage)/100,
+        'adjusted_life_expectancy': adjusted_life_expectancy,
+        'retirement_less_than_life_expectancy': retirement_less_than_life_expectancy,
+    })
+
+    #What Else Could You Do
+    stats.update({
+        'dollar_bills_in_a_row_miles': total_cost/10320,
+        'years_in_hotel': (total_cost/110)/365,
+        'roses_every_week': (total_cost/75)/52,
+        'dollar_bills_in_a_row_miles_after_tub': (total_cost - 60000)/10320,
+        'how_many_trampolines': (total_cost - 90000)/300,
+        'number_of_friends_on_cruise': total_cost/800,
+        'height_of_quarters_stacked': (total_cost - 60000)*4*0.069/12/5280,
+        'all_inclusive_resort': total_cost/4000,
+        'roses_every_day': (total_cost/50)/365,
+        'all_inclusive_resort_two_weeks': total_cost/7000,
+        'gold_bars': total_cost/500000,
+        'gallardos': total_cost/200000,
+        'five_star_hotel': (total_cost/550)/365,
+        'orcas': total_cost/1000000,
+        'bouquet': (total_cost/220)/365,
+    })
+
+    #Your End Date, one row for every end date that is still ahead
+    sweep = EndDateSweep(years_left, total_cost, total_number_of_items, total_time, total_hours)
+    stats['end_dates'] = [{
+        'offset': offset,
+        'years_left': float(sweep['years_left'][number]),
+        'cost_per_year': float(sweep['cost_per_year'][number]),
+        'days_per_goal': float(sweep['days_per_goal'][number]),
+        'days_per_year': float(sweep['days_per_year'][number]),
+        'hours_per_month': float(sweep['hours_per_month'][number]),
+    } for number, offset in enumerate(END_DATE_OFFSETS) if sweep['valid'][number]]
+
+    #Retirement, only worked out for users who include it since the section is not shown otherwise
+    if include_retirement:
+        stats.update(RetirementStats(age, life_expectancy, yearly_earnings, retirement, retirement_savings, percent_of_yearly_wage))
+
+    return stats
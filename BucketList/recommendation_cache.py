@@ -0,0 +1,151 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+RECOMMENDATION_CACHE_TIMEOUT = getattr(settings, 'RECOMMENDATION_CACHE_TIMEOUT', 60 * 60 * 24)
+#Relative change in a site wide average that makes every cached recommendation page stale
+RECOMMENDATION_SITE_TOLERANCE = getattr(settings, 'RECOMMENDATION_SITE_TOLERANCE', 0.05)
+#Seconds each process keeps its own cache hit and miss counts before adding them to the shared counters
+RECOMMENDATION_STATS_FLUSH_INTERVAL = getattr(settings, 'RECOMMENDATION_STATS_FLUSH_INTERVAL', 60)
+
+SITE_VERSION_KEY = 'recommendation_site_version'
+SITE_AVERAGES_KEY = 'recommendation_site_averages'
+GOAL_TYPE_COUNTS_VERSION_KEY = 'goal_type_counts_version'
+HITS_KEY = 'recommendation_cache_hits'
+MISSES_KEY = 'recommendation_cache_misses'
+
+
+def RecommendationCacheKey(user_id):
+    return 'recommendation_%s' % user_id
+
+
+def RecommendationVersionKey(user_id):
+    return 'recommendation_version_%s' % user_id
+
+
+def _new_version(key):
+    #Versions start from the time so a version lost from the cache never comes back with a number an old page was stored under
+    version = int(time.time() * 1000)
+    cache.set(key, version, None)
+    return version
+
+
+def _bump(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        _new_version(key)
+
+
+_counts = {HITS_KEY: 0, MISSES_KEY: 0}
+_counts_lock = threading.Lock()
+_last_flush = time.time()
+
+
+def _flush_counts():
+    #Adds this processes hit and miss counts to the shared counters and starts counting from zero again
+    global _last_flush
+    with _counts_lock:
+        counts = dict(_counts)
+        for key in _counts:
+            _counts[key] = 0
+        _last_flush = time.time()
+    for key, count in counts.items():
+        if count and not cache.add(key, count, None):
+            try:
+                cache.incr(key, count)
+            except ValueError:
+                pass
+
+
+def _count(key):
+    #Counts a hit or miss in this process, the counts reach the cache at most every RECOMMENDATION_STATS_FLUSH_INTERVAL seconds so serving a page does not also write a counter
+    with _counts_lock:
+        _counts[key] += 1
+        due = time.time() - _last_flush >= RECOMMENDATION_STATS_FLUSH_INTERVAL
+    if due:
+        _flush_counts()
+
+
+def BumpRecommendationVersion(user_id):
+    #Takes a user id and makes their cached recommendation page stale
+    _bump(RecommendationVersionKey(user_id))
+
+
+def BumpGoalTypeCountsVersion():
+    #Makes the site goal distribution chart stale, called whenever a goal is added to, moved between or removed from the goal types
+    _bump(GOAL_TYPE_COUNTS_VERSION_KEY)
+
+
+def _averages_moved(previous, averages):
+    for name, values in averages.items():
+        if name not in previous:
+            return True
+        for old, new in zip(previous[name], values):
+            if abs(new - old) > RECOMMENDATION_SITE_TOLERANCE * max(abs(old), 1):
+                return True
+    return False
+
+
+def CheckSiteAverages():
+    #Makes every cached recommendation page stale once the site wide averages have moved more than RECOMMENDATION_SITE_TOLERANCE since the pages were last made stale, smaller moves are not worth recomputing every page for
+    from BucketList.aggregates import SiteAverages
+    averages = SiteAverages()
+    previous = cache.get(SITE_AVERAGES_KEY)
+    if previous is None or _averages_moved(previous, averages):
+        _bump(SITE_VERSION_KEY)
+        cache.set(SITE_AVERAGES_KEY, averages, None)
+
+
+def _versions(cached, version_key):
+    #Takes the result of a get_many that included the user and site version keys and returns both versions, starting any that are missing
+    return cached.get(version_key) or _new_version(version_key), cached.get(SITE_VERSION_KEY) or _new_version(SITE_VERSION_KEY)
+
+
+def ChartVersions(user_id):
+    #Takes a user id and returns their version and the goal type counts version with one cache call, they change whenever the users own charts or the site chart do
+    version_key = RecommendationVersionKey(user_id)
+    cached = cache.get_many([version_key, GOAL_TYPE_COUNTS_VERSION_KEY])
+    return cached.get(version_key) or _new_version(version_key), cached.get(GOAL_TYPE_COUNTS_VERSION_KEY) or _new_version(GOAL_TYPE_COUNTS_VERSION_KEY)
+
+
+def CachedRecommendation(user_id, age, compute):
+    #Takes a user id, the users age and a function that computes their recommendation page context and returns the context.  The page and both versions it was computed at are read with one cache call, compute only runs when either version moved on.  A None context is not stored
+    data_key = RecommendationCacheKey(user_id)
+    version_key = RecommendationVersionKey(user_id)
+    cached = cache.get_many([data_key, version_key, SITE_VERSION_KEY])
+    user_version, site_version = _versions(cached, version_key)
+    #The age is part of the version so birthdays are picked up
+    version = (user_version, site_version, age)
+
+    entry = cached.get(data_key)
+    if entry is not None and entry[0] == version:
+        _count(HITS_KEY)
+        return entry[1]
+
+    _count(MISSES_KEY)
+    context = compute()
+    if context is not None:
+        cache.set(data_key, (version, context), RECOMMENDATION_CACHE_TIMEOUT)
+    return context
+
+
+def RecommendationCacheStats():
+    #Returns the recommendation cache hits, misses, and hit rate as a percent.  They are approximate, each process holds back up to RECOMMENDATION_STATS_FLUSH_INTERVAL seconds of counts and loses them if it exits first
+    _flush_counts()
+    counters = cache.get_many([HITS_KEY, MISSES_KEY])
+    hits = counters.get(HITS_KEY, 0)
+    misses = counters.get(MISSES_KEY, 0)
+    hit_rate = float(hits) / (hits + misses) * 100 if hits + misses else 0.0
+    return {'hits': hits, 'misses': misses, 'hit_rate': hit_rate}
+
+
+def ResetRecommendationCacheStats():
+    #Counts other processes still hold back are added after the reset
+    with _counts_lock:
+        for key in _counts:
+            _counts[key] = 0
+    cache.delete_many([HITS_KEY, MISSES_KEY])
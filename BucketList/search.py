@@ -0,0 +1,100 @@
+import re
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db.models import Count
+from fuzzywuzzy import fuzz
+
+from BucketList.models import BucketListItem, GoalToken, GoalTrigram, UsernameTrigram
+
+
+#Words too common to narrow down a search on their own
+STOP_WORDS = frozenset([
+    'a', 'an', 'and', 'at', 'be', 'by', 'for', 'from', 'go', 'in', 'into', 'is', 'it',
+    'my', 'of', 'on', 'or', 'the', 'to', 'up', 'with',
+])
+
+#How many goals and users are fuzzy scored for a single search
+SEARCH_CANDIDATE_LIMIT = getattr(settings, 'SEARCH_CANDIDATE_LIMIT', 300)
+
+#How many results the search page shows
+SEARCH_RESULTS_SHOWN = 20
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+def NormalizedTokens(text):
+    #Takes text and returns the set of lowercase words used to index and search it.  Stop words are dropped unless the text has nothing else
+    tokens = set(TOKEN_RE.findall(text.lower()))
+    return (tokens - STOP_WORDS) or tokens
+
+
+def Trigrams(text):
+    #Takes text and returns the set of three letter sequences of its words.  Words are padded so their first and last letters carry extra weight and short words still produce trigrams
+    trigrams = set()
+    for word in TOKEN_RE.findall(text.lower()):
+        padded = '  %s ' % word
+        for start in range(len(padded) - 2):
+            trigrams.add(padded[start:start + 3])
+    return trigrams
+
+
+def IndexGoal(item):
+    #Takes a BucketListItem and replaces its GoalTokens and GoalTrigrams with the ones of its current text
+    GoalToken.objects.filter(item = item).delete()
+    GoalToken.objects.bulk_create([GoalToken(token = token, item = item) for token in NormalizedTokens(item.text)])
+    GoalTrigram.objects.filter(item = item).delete()
+    GoalTrigram.objects.bulk_create([GoalTrigram(trigram = trigram, item = item) for trigram in Trigrams(item.text)])
+
+
+def IndexUsername(user):
+    #Takes a User and replaces its UsernameTrigrams, nothing is written when the username has not changed
+    trigrams = Trigrams(user.username)
+    if set(UsernameTrigram.objects.filter(user = user).values_list('trigram', flat = True)) == trigrams:
+        return
+    UsernameTrigram.objects.filter(user = user).delete()
+    UsernameTrigram.objects.bulk_create([UsernameTrigram(trigram = trigram, user = user) for trigram in trigrams])
+
+
+def GoalSearchCandidates(text, limit = SEARCH_CANDIDATE_LIMIT):
+    #Takes search text and returns at most limit BucketListItems, goals sharing whole words with the text come first and the rest are filled by trigram overlap so misspelled words still match
+    tokens = NormalizedTokens(text)
+    if not tokens:
+        return []
+    word_matches = (GoalToken.objects.filter(token__in = tokens)
+                    .values_list('item').annotate(shared = Count('id')).order_by('-shared')[:limit])
+    trigram_matches = (GoalTrigram.objects.filter(trigram__in = Trigrams(text))
+                       .values_list('item').annotate(shared = Count('id')).order_by('-shared')[:limit])
+    item_ids = []
+    for item_id, shared in list(word_matches) + list(trigram_matches):
+        if item_id not in item_ids:
+            item_ids.append(item_id)
+    return list(BucketListItem.objects.filter(pk__in = item_ids[:limit]))
+
+
+def UserSearchCandidates(text, limit = SEARCH_CANDIDATE_LIMIT):
+    #Takes search text and returns the at most limit Users whose usernames share the most trigrams with it
+    trigrams = Trigrams(text)
+    if not trigrams:
+        return []
+    matches = (UsernameTrigram.objects.filter(trigram__in = trigrams)
+               .values_list('user').annotate(shared = Count('id')).order_by('-shared')[:limit])
+    return list(User.objects.filter(pk__in = [user_id for user_id, shared in matches]))
+
+
+def RankSearchResults(text, items, users):
+    #Takes text, BucketListItems, and Users and returns the SEARCH_RESULTS_SHOWN of them most similar to the text.  Uses FuzzyWuzzy string comparison.
+    list_of_results = []
+    for goal in items:
+        item_similarity = fuzz.token_set_ratio(text, goal.text)
+        list_of_results.append((item_similarity, goal))
+    for user in users:
+        user_similarity = fuzz.token_set_ratio(text, user.username)
+        list_of_results.append((user_similarity, user))
+    sorted_list = sorted(list_of_results, key=lambda tup: tup[0], reverse = True)
+    return [result for similarity, result in sorted_list[:SEARCH_RESULTS_SHOWN]]
+
+
+def SearchResults(text, limit = SEARCH_CANDIDATE_LIMIT):
+    #Takes text and returns BucketListItems and Users that are the most similar to the text entered.  Only the candidates picked from the search indexes are fuzzy scored, limit sets how many of each
+    return RankSearchResults(text, GoalSearchCandidates(text, limit), UserSearchCandidates(text, limit))
@@ -0,0 +1,80 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from avatar.util import get_primary_avatar_urls
+
+from BucketList.models import BucketListItem, Comment
+
+
+#Seconds a rendered sidebar is kept, changes to goals and comments replace it straight away so this only bounds how old the "added ... ago" times can get
+SIDEBAR_CACHE_TIMEOUT = getattr(settings, 'SIDEBAR_CACHE_TIMEOUT', 60)
+
+GOALS_VERSION_KEY = 'sidebar_goals_version'
+COMMENTS_VERSION_KEY = 'sidebar_comments_version'
+
+
+#Size of the publisher avatars in the Recently Added sidebar
+RECENTLY_ADDED_AVATAR_SIZE = 25
+
+
+def RecentlyAdded(count):
+    #Returns the newest open goals with their publishers and the publishers avatar urls, looked up together with one query
+    items = list(BucketListItem.objects.filter(crossed_off = False).select_related('pub_by').order_by('-pub_date')[:count])
+    return {'items': items,
+            'avatar_urls': get_primary_avatar_urls([item.pub_by for item in items], RECENTLY_ADDED_AVATAR_SIZE),
+            'avatar_size': RECENTLY_ADDED_AVATAR_SIZE}
+
+
+def RecentlyCompleted(count):
+    #Returns the most recently crossed off goals
+    return {'items': BucketListItem.objects.filter(crossed_off = True).order_by('-pub_date')[:count]}
+
+
+def TalkedAbout(count):
+    #Returns the newest comments with the goals they are on
+    return {'items': Comment.objects.select_related('item').order_by('-created')[:count]}
+
+
+#Each sidebar, the function that finds the context it is rendered with, its template and the versions that make it stale.  Comments show the text of their goal so goal changes make them stale too
+SIDEBARS = {
+    'recently_added': (RecentlyAdded, 'BucketList/sidebar/recently_added.html', (GOALS_VERSION_KEY,)),
+    'recently_completed': (RecentlyCompleted, 'BucketList/sidebar/recently_completed.html', (GOALS_VERSION_KEY,)),
+    'talked_about': (TalkedAbout, 'BucketList/sidebar/talked_about.html', (GOALS_VERSION_KEY, COMMENTS_VERSION_KEY)),
+    }
+
+
+def BumpSidebarVersion(key):
+    #Takes GOALS_VERSION_KEY or COMMENTS_VERSION_KEY and makes every sidebar rendered from it stale
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, int(time.time() * 1000), None)
+
+
+def Sidebars(**counts):
+    #Takes how many entries each sidebar should have, like Sidebars(recently_added = 5, talked_about = 4), and returns the rendered sidebars under the same names.  The versions and the sidebars are each read with one cache call, only sidebars that are stale or missing are queried and rendered.  The cache is memcached (see CACHES in settings), so a page whose sidebars are all cached runs no database query for them
+    versions = cache.get_many([GOALS_VERSION_KEY, COMMENTS_VERSION_KEY])
+    for key in (GOALS_VERSION_KEY, COMMENTS_VERSION_KEY):
+        if key not in versions:
+            versions[key] = int(time.time() * 1000)
+            cache.add(key, versions[key], None)
+
+    keys = {}
+    for name, count in counts.items():
+        find, template, version_keys = SIDEBARS[name]
+        keys[name] = 'sidebar_%s_%s_%s' % (name, count, '_'.join(str(versions[key]) for key in version_keys))
+    cached = cache.get_many(keys.values())
+
+    sidebars = {}
+    for name, count in counts.items():
+        html = cached.get(keys[name])
+        if html is None:
+            find, template, version_keys = SIDEBARS[name]
+            html = render_to_string(template, find(count))
+            cache.set(keys[name], html, SIDEBAR_CACHE_TIMEOUT)
+        sidebars[name] = mark_safe(html)
+    return sidebars
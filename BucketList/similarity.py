@@ -0,0 +1,188 @@
+import heapq
+import multiprocessing
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, IntegrityError, transaction
+from django.db.models import Count, Max, Min
+from fuzzywuzzy import fuzz
+
+from BucketList.models import BucketListItem, GoalSimilarity, GoalTextHash
+
+
+#Corpora with at least this many goals are scored across the process pool, smaller ones in the request process
+SIMILARITY_PARALLEL_THRESHOLD = getattr(settings, 'SIMILARITY_PARALLEL_THRESHOLD', 20000)
+SIMILARITY_WORKERS = getattr(settings, 'SIMILARITY_WORKERS', multiprocessing.cpu_count())
+#Shards per worker, more shards even out slow and fast workers
+SHARDS_PER_WORKER = 4
+
+#How many similar goals GoalSimilarity stores for each goal
+MOST_SIMILAR_COUNT = 3
+
+#Seconds to wait after a goal is saved before finding its neighbours, goals saved in the meantime are found in the same refresh
+SIMILAR_GOALS_REFRESH_DELAY = getattr(settings, 'SIMILAR_GOALS_REFRESH_DELAY', 5)
+#Most goals one background refresh finds the neighbours of before it hands the rest to the next one
+SIMILAR_GOALS_REFRESH_LIMIT = getattr(settings, 'SIMILAR_GOALS_REFRESH_LIMIT', 50)
+
+SIMILAR_GOALS_REFRESH_PENDING_KEY = 'similar_goals_refresh_pending'
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = multiprocessing.Pool(SIMILARITY_WORKERS)
+    return _pool
+
+
+def _similar_shard(args):
+    #Returns the shards top k goals as (similarity, -id) so ties go to the oldest goal
+    text, shard, k = args
+    scored = ((fuzz.token_set_ratio(text, goal_text), -goal_id) for goal_id, goal_text in shard)
+    return heapq.nlargest(k, (score for score in scored if score[0] > 0))
+
+
+def _rank_shard(args):
+    #Returns (id, similarity) for each goal of the shard, scored from the goals side as if the text were one of its candidate neighbours
+    text, shard = args
+    return [(goal_id, fuzz.token_set_ratio(goal_text, text)) for goal_id, goal_text in shard]
+
+
+def _MapShards(function, text, goals, *args):
+    #Takes a shard function, text and a queryset of BucketListItems and returns the function's result for each shard.  Large corpora are split into shards scored across the process pool, smaller ones are one shard scored in this process
+    corpus = list(goals.values_list('id', 'text'))
+    if len(corpus) < SIMILARITY_PARALLEL_THRESHOLD or SIMILARITY_WORKERS < 2:
+        return [function((text, corpus) + args)]
+    shard_size = -(-len(corpus) // (SIMILARITY_WORKERS * SHARDS_PER_WORKER))
+    shards = [(text, corpus[start:start + shard_size]) + args for start in range(0, len(corpus), shard_size)]
+    return _get_pool().map(function, shards)
+
+
+def TopSimilar(text, goals, k = MOST_SIMILAR_COUNT):
+    #Takes text and a queryset of BucketListItems and returns the k most similar as (similarity, -id) tuples, merged from the per shard results
+    return heapq.nlargest(k, (score for shard in _MapShards(_similar_shard, text, goals, k) for score in shard))
+
+
+def _most_similar_output(list_of_goals):
+    #Takes (goal, similarity) pairs from most to least similar and returns them in the (list_of_goals, highest_accuracy) shape the templates use, empty places are filled with ('item', 0)
+    highest_accuracy = list_of_goals[0][1] if list_of_goals else 0
+    list_of_goals = list_of_goals + [('item', 0)] * (MOST_SIMILAR_COUNT - len(list_of_goals))
+    return list_of_goals, highest_accuracy
+
+
+def ExactSameGoal(item, goals):
+    #Takes the text of a BucketListItem and a queryset of BucketListItems and finds any exact matches in it with one indexed lookup on text_hash, outputs the matching goals and how many there are
+    list_of_goals = list(goals.filter(text_hash = GoalTextHash(item)).select_related('pub_by'))
+    return list_of_goals, len(list_of_goals)
+
+
+def _GoalState(goal_id, lock = False):
+    #Returns a goals (neighbours_seen_id, text_hash), or None when it was deleted.  With lock set the goal stays locked until the end of the transaction, databases without row locks such as SQLite skip the lock and concurrent writers fail on the GoalSimilarity unique_together instead
+    goals = BucketListItem.objects.filter(pk = goal_id)
+    if lock:
+        goals = goals.select_for_update()
+    rows = list(goals.values_list('neighbours_seen_id', 'text_hash'))
+    return rows[0] if rows else None
+
+
+def _ReplaceSimilarGoals(goal_id, top):
+    #Swaps a locked goals GoalSimilarity rows for the (similarity, -id) tuples in top
+    GoalSimilarity.objects.filter(item_id = goal_id).delete()
+    GoalSimilarity.objects.bulk_create([GoalSimilarity(item_id = goal_id, neighbour_id = -negative_id, similarity = similarity)
+                                        for similarity, negative_id in top])
+
+
+def RefreshSimilarGoals(item, rebuild = False):
+    #Takes a BucketListItem and updates its GoalSimilarity rows.  Only goals added since the last refresh are scored and merged with the stored neighbours, when neighbours_seen_id is 0 or rebuild is set every goal of other users is scored.  The goals neighbours are written while it is locked, if another refresh or an edit of its text got there first while this one was scoring that one wins
+    started = (item.neighbours_seen_id, item.text_hash)
+    seen_id = BucketListItem.objects.aggregate(Max('id'))['id__max'] or 0
+    others = BucketListItem.objects.exclude(pub_by = item.pub_by_id).filter(pk__lte = seen_id)
+    if item.neighbours_seen_id and not rebuild:
+        stored = [(similar.similarity, -similar.neighbour_id) for similar in GoalSimilarity.objects.filter(item = item)]
+        others = others.filter(pk__gt = item.neighbours_seen_id)
+    else:
+        stored = []
+    top = heapq.nlargest(MOST_SIMILAR_COUNT, stored + TopSimilar(item.text, others))
+
+    try:
+        with transaction.atomic():
+            current = _GoalState(item.pk, lock = True)
+            if current == started:
+                _ReplaceSimilarGoals(item.pk, top)
+                #update() so the goals own save signals do not run again
+                BucketListItem.objects.filter(pk = item.pk).update(neighbours_seen_id = seen_id)
+    except IntegrityError:
+        #A concurrent refresh of the same goal wrote its rows first
+        current = _GoalState(item.pk)
+    if current != started:
+        item.neighbours_seen_id = current[0] if current else 0
+        return
+    item.neighbours_seen_id = seen_id
+    if not started[0]:
+        OfferToNeighbours(item)
+
+
+def _AddSimilarGoal(goal_id, neighbour_id, similarity):
+    #Merges one neighbour into a goals stored top MOST_SIMILAR_COUNT while the goal is locked, goals waiting to be refreshed from scratch are left to that refresh
+    try:
+        with transaction.atomic():
+            current = _GoalState(goal_id, lock = True)
+            if not current or not current[0]:
+                return
+            stored = [(similar.similarity, -similar.neighbour_id) for similar in GoalSimilarity.objects.filter(item_id = goal_id)]
+            top = heapq.nlargest(MOST_SIMILAR_COUNT, [score for score in stored if score[1] != -neighbour_id] + [(similarity, -neighbour_id)])
+            if top != heapq.nlargest(MOST_SIMILAR_COUNT, stored):
+                _ReplaceSimilarGoals(goal_id, top)
+    except IntegrityError:
+        #A concurrent refresh of the goal wrote its rows first, it scored every goal itself
+        pass
+
+
+def OfferToNeighbours(item):
+    #Takes a BucketListItem whose neighbours were just found from scratch and adds it to the stored neighbours of other users goals that were refreshed after it was added and now rank it in their top MOST_SIMILAR_COUNT.  Those goals only score goals newer than their neighbours_seen_id, so without this an edited goals new text is never compared with them
+    goals = BucketListItem.objects.exclude(pub_by = item.pub_by_id).filter(neighbours_seen_id__gte = item.pk)
+    weakest = dict((row['item'], (row['count'], row['weakest']))
+                   for row in GoalSimilarity.objects.filter(item__in = goals).values('item').annotate(count = Count('id'), weakest = Min('similarity')))
+    for shard in _MapShards(_rank_shard, item.text, goals):
+        for goal_id, similarity in shard:
+            count, floor = weakest.get(goal_id, (0, 0))
+            if similarity > 0 and (count < MOST_SIMILAR_COUNT or similarity >= floor):
+                _AddSimilarGoal(goal_id, item.pk, similarity)
+
+
+def RefreshStaleSimilarGoals(limit = SIMILAR_GOALS_REFRESH_LIMIT):
+    #Finds the neighbours of up to limit goals whose neighbours are not known yet, oldest first, and returns whether any are left
+    stale = BucketListItem.objects.filter(neighbours_seen_id = 0).order_by('id')
+    for item in stale[:limit]:
+        RefreshSimilarGoals(item)
+    return stale.exists()
+
+
+def _refresh_in_background():
+    try:
+        cache.delete(SIMILAR_GOALS_REFRESH_PENDING_KEY)
+        if RefreshStaleSimilarGoals():
+            ScheduleSimilarGoalsRefresh()
+    finally:
+        #The timer thread opened its own database connection
+        connection.close()
+
+
+def ScheduleSimilarGoalsRefresh():
+    #Called when a goals neighbours need finding.  Starts a background refresh unless one is already pending, so saving a goal never scores every other goal in the request
+    if cache.add(SIMILAR_GOALS_REFRESH_PENDING_KEY, True, SIMILAR_GOALS_REFRESH_DELAY * 2):
+        timer = threading.Timer(SIMILAR_GOALS_REFRESH_DELAY, _refresh_in_background)
+        timer.daemon = True
+        timer.start()
+
+
+def SimilarGoals(item):
+    #Takes a BucketListItem and returns its stored GoalSimilarity neighbours in the (list_of_goals, highest_accuracy) shape the templates use, goals added since they were found are scored first
+    if item.neighbours_seen_id == 0 or BucketListItem.objects.exclude(pub_by = item.pub_by_id).filter(pk__gt = item.neighbours_seen_id).exists():
+        RefreshSimilarGoals(item)
+    similar = GoalSimilarity.objects.filter(item = item).select_related('neighbour__pub_by').order_by('-similarity', 'neighbour')
+    return _most_similar_output([(goal.neighbour, goal.similarity) for goal in similar])
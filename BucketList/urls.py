@@ -14,6 +14,7 @@ urlpatterns = patterns('',
     url(r'^mylist/crossoff/(?P<id>\w+)/', views.cross_off_my_list_item, name = 'cross off'),
     url(r'^mylist/deleteitem/(?P<id>\w+)/', views.delete_my_list_item, name = 'delete list item'),
     url(r'^mylist/recommendation/$', views.recommendation, name = 'recommendation'),
+    url(r'^mylist/recommendation/charts/(?P<name>\w+)/$', views.recommendation_chart, name = 'recommendation chart'),
     url(r'^mylist/compare/(?P<id>\w+)/', views.compare_my_list_item, name = 'compare list item'),
     url(r'^profile/edit/$', views.edit_profile, name = 'edit profile'),
     url(r'^tutorial/$', views.tutorial, name = 'tutorial'),